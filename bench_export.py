@@ -0,0 +1,135 @@
+#! /usr/bin/env python3
+
+# Export benchmark over the three demo figures of test_typo.py.
+#
+# Each figure is saved to SVG and to PNG at 450 dpi, as in test_typo.py, then
+# to PNG and TIFF at 450 dpi, either with one savefig call per file or with a
+# single fig.export call. The text caches are cleared before every run, so
+# both start cold, and building the figure is not timed.
+#
+# Usage: python bench_export.py [repeats]
+
+################################################
+### Load Dependencies
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from matplotlib import rcParams
+import matplotlib
+matplotlib.use('agg')
+import matplotlib.pyplot as plt
+
+from mpltypo import PointFigure, SpacedText
+from matplotpatch.metrics import metric_cache, style_cache
+
+################################################
+### Demo figures
+
+def setup():
+
+    plt.style.use('./point.mplstyle')
+    rcParams["font.serif"] = 'Merriweather'
+    rcParams["font.sans-serif"] = 'Open Sans'
+    rcParams["font.size"] = 8
+
+def demo_axes():
+
+    fig = plt.figure(figsize=(8,4), FigureClass=PointFigure)
+    fig.show_dotgrid(system='pica')
+
+    for x, side in [(6, 'left'), (30, 'right')]:
+        ax = fig.add_axes([x,6,12,12], margin=True, projection='pointaxes')
+        ax.text(-2, 3, f'Title for figure {side}', size=16, weight='bold', anchor='tl', system='pica', fontfamily='serif')
+        ax.text(-2, 2, f'Subtitle for figure {side}', size=10, anchor='tl', system='pica', fontfamily='serif')
+        ax.align_ticklabels(axis='x', y=-2, ha='center', va='baseline')
+        ax.align_ticklabels(axis='y', x=-2, ha='left')
+
+    return fig
+
+def demo_wrap():
+
+    fig = plt.figure(figsize=(4,2), FigureClass=PointFigure)
+    fig.show_dotgrid(system='pica')
+
+    fig.text(2,8,"Large fonts", system='pica', size=20, linespacing=24/20, linewidth=6, va='first_baseline', fontfamily='serif')
+    fig.text(9,8,"can be perfectly aligned with smaller fonts", system='pica', size=10, linespacing=12/10, linewidth=6, va='first_baseline', fontfamily='serif')
+    fig.text(16,8,"as long as the line spacing of each font is a multiple of the smallest line spacing. Here, the line spacing is 6, 12 and 24.",
+             system='pica', size=4, linespacing=6/4, linewidth=6, style='italic', va='first_baseline', fontfamily='serif')
+
+    fig.line([2,22],[8,8], system='pica', c=(0.8,0.8,0.8), lw=0.5)
+    fig.line([2,22],[6,6], system='pica', c=(0.8,0.8,0.8), lw=0.5)
+
+    return fig
+
+def demo_mix():
+
+    para = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Nam vitae porta nulla, eu accumsan justo. Aenean nec semper massa, ultrices congue nulla. Sed tempus sed lorem et consectetur. Cras id varius lorem."
+
+    fig = plt.figure(figsize=(5,5), FigureClass=PointFigure)
+    fig.show_dotgrid(system='pica')
+
+    for rect, title in [([4, 4, 9, 22], 'tall'), ([17, 17, 9, 9], 'square')]:
+        ax = fig.add_axes(rect, margin=True, projection='pointaxes')
+        ax.align_ticklabels(axis='x', y=-1, system='pica', va='baseline')
+        ax.align_ticklabels(axis='y', x=-2, system='pica', ha='left')
+        ax.text(-2,2, f'Title for {title} figure', system='pica', anchor='tl', size=12, weight='bold', fontfamily='serif')
+        ax.text(-2,1, 'Subtitle is not bold', system='pica', anchor='tl', size=8, fontfamily='serif')
+
+    fig.text(17, 12, para, system='pica', fontsize=8, linespacing=12/8, linewidth=9, va='first_baseline', fontfamily='serif')
+
+    return fig
+
+DEMOS = [demo_axes, demo_wrap, demo_mix]
+
+################################################
+### Benchmark
+
+def clear_caches():
+
+    metric_cache.clear()
+    style_cache.clear()
+    SpacedText._layout_cache.clear()
+
+OUTPUTS = [
+    ('svg+png', [('svg', None), ('png', 450)]),
+    ('png+tif', [('png', 450), ('tif', 450)]),
+]
+
+def save_twice(fig, stem, outputs):
+    for ext, dpi in outputs:
+        fig.savefig(f"{stem}.{ext}", dpi=dpi)
+
+def save_export(fig, stem, outputs):
+    fig.export([f"{stem}.{ext}" for ext, _ in outputs], dpis=[dpi for _, dpi in outputs])
+
+def time_save(build, save, stem, outputs):
+
+    fig = build()
+    clear_caches()
+
+    t0 = time.perf_counter()
+    save(fig, stem, outputs)
+    elapsed = time.perf_counter() - t0
+
+    plt.close(fig)
+    return elapsed * 1000
+
+def main(repeats=5):
+
+    setup()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'':20}  savefig x2 (ms)  export (ms)")
+        for label, outputs in OUTPUTS:
+            for build in DEMOS:
+                stem = os.path.join(tmp, build.__name__)
+                twice = statistics.median(time_save(build, save_twice, stem, outputs) for _ in range(repeats))
+                once = statistics.median(time_save(build, save_export, stem, outputs) for _ in range(repeats))
+                print(f"{build.__name__ + ' ' + label:20}  {twice:15.1f}  {once:11.1f}")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
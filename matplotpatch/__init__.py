@@ -1,12 +1,44 @@
 #! /usr/bin/env python3
 
-from .figure import FigurePlus
+# Submodules are only imported when one of their names is first used, so
+# `from matplotpatch import transform_factory` does not pull in the figure,
+# axes and text machinery (or pyplot).
 
-from .axes import AxesPlus, decorator_axes
+import importlib
 
-from .patch import patch
+_exports = {
+    'figure': ['FigurePlus'],
+    'axes': ['AxesPlus', 'decorator_axes'],
+    'patch': ['patch', 'unpatch', 'patched', 'is_patched'],
+    'hooks': ['install_text_class'],
+    'text': ['TextPlus', 'TextMuliColor', 'TextMuliColorBatch', 'RichText', 'RichTextCollection'],
+    'transforms': ['transform_factory', 'PointTransform', 'decorator_custom_transform', 'TransformCache', 'get_transform_cache', 'convert', 'conversion_matrix'],
+    'layout': ['get_layout_geometry', 'snap_to_baseline'],
+    'grid': ['DotGrid', 'GridLevel', 'BaselineGrid'],
+    'guides': ['GuideLayer'],
+    'metrics': ['MetricCache', 'metric_cache', 'StyleCache', 'style_cache', 'get_cache_info', 'get_font_key', 'get_renderer_key', 'HeadlessRenderer', 'get_headless_renderer'],
+    'units': ['UnitRegistry', 'unit_registry', 'register_unit'],
+    'export': ['export_figure', 'export_batch', 'ExportResult'],
+}
 
-from .text import TextPlus, TextMuliColor
+_modules = {name: module for module, names in _exports.items() for name in names}
 
-from .transforms import transform_factory, PointTransform, decorator_custom_transform
+__all__ = list(_modules)
 
+def __getattr__(name):
+
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name = _modules[name]
+    module = importlib.import_module(f'.{module_name}', __name__)
+
+    # Bind every export of the submodule at once. Importing .patch binds
+    # the submodule itself to 'patch', which this also overwrites.
+    for export in _exports[module_name]:
+        globals()[export] = getattr(module, export)
+
+    return globals()[name]
+
+def __dir__():
+    return sorted(set(globals()) | set(_modules))
@@ -6,17 +6,76 @@
 import numpy as np
 
 from matplotlib.axes import Axes
-import matplotlib.pyplot as plt
-from matplotlib.offsetbox import AnchoredOffsetbox, TextArea, HPacker, VPacker
+from matplotlib.axis import XAxis, YAxis, XTick, YTick
 
-from .text import TextPlus, TextMuliColor
+from .text import TextPlus, TextMuliColor, TextMuliColorBatch
 from .transforms import transform_factory, decorator_custom_transform
 
 ################################################
 
-class AxesPlus(Axes):
+def _to_text_plus(text):
+    """
+    Return a TextPlus with the string, position and properties of text, to
+    take its place.
+    """
+    
+    new = TextPlus(*text.get_unitless_position(), text=text.get_text())
+    new.update_from(text)
+    new.set_rotation_mode(text.get_rotation_mode())
+    new.set_zorder(text.get_zorder())
+    new.set_figure(text.figure)
+    if text.axes is not None:
+        new.axes = text.axes
+    
+    return new
+
+class _TickPlus:
+    """Tick mixin, with TextPlus labels"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        self.label1 = _to_text_plus(self.label1)
+        self.label2 = _to_text_plus(self.label2)
+
+class XTickPlus(_TickPlus, XTick):
+    pass
+
+class YTickPlus(_TickPlus, YTick):
+    pass
+
+class _AxisPlus:
+    """
+    Axis mixin, with a TextPlus label and offset text, and ticks built by
+    the tick_class of the axis.
     """
     
+    tick_class = None
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        self.label = _to_text_plus(self.label)
+        self.offsetText = _to_text_plus(self.offsetText)
+    
+    def _get_tick(self, major):
+        
+        if major:
+            tick_kw = self._major_tick_kw
+        else:
+            tick_kw = self._minor_tick_kw
+        return self.tick_class(self.axes, 0, major=major, **tick_kw)
+
+class XAxisPlus(_AxisPlus, XAxis):
+    tick_class = XTickPlus
+
+class YAxisPlus(_AxisPlus, YAxis):
+    tick_class = YTickPlus
+
+class AxesPlus(Axes):
+    """
+    Axes whose text (titles, axis labels, tick labels and `text`) is built
+    as TextPlus, whatever the Text class of matplotlib.
     """
     name = "axesplus"
     
@@ -26,6 +85,7 @@ class AxesPlus(Axes):
             if 'figure' in kwargs.keys():
                 fig = kwargs['figure']
             else:
+                import matplotlib.pyplot as plt
                 fig = plt.gcf()
                             
             trans = transform_factory(object=fig, system=system)
@@ -37,13 +97,44 @@ class AxesPlus(Axes):
         
         super().__init__(fig, rect, **kwargs)
         
+    def _init_axis(self):
+        
+        # As Axes._init_axis, with TextPlus axes
+        self.xaxis = XAxisPlus(self)
+        self.spines['bottom'].register_axis(self.xaxis)
+        self.spines['top'].register_axis(self.xaxis)
+        self.yaxis = YAxisPlus(self)
+        self.spines['left'].register_axis(self.yaxis)
+        self.spines['right'].register_axis(self.yaxis)
+        self._update_transScale()
+        
+    def cla(self):
+        super().cla()
+        
+        self.title = _to_text_plus(self.title)
+        self._left_title = _to_text_plus(self._left_title)
+        self._right_title = _to_text_plus(self._right_title)
+        
     @decorator_custom_transform
     def plot(self, *args, **kwargs):
         return super().plot(*args, **kwargs)
 
     @decorator_custom_transform
-    def text(self, *args, **kwargs):
-        return super().text(*args, **kwargs)
+    def text(self, x, y, s, fontdict=None, **kwargs):
+        
+        # As Axes.text, but building a TextPlus
+        effective_kwargs = {
+            'verticalalignment': 'baseline',
+            'horizontalalignment': 'left',
+            'transform': self.transData,
+            'clip_on': False,
+            **(fontdict if fontdict is not None else {}),
+            **kwargs,
+        }
+        t = TextPlus(x, y, text=s, **effective_kwargs)
+        t.set_clip_path(self.patch)
+        self._add_text(t)
+        return t
 
     def set_yticklabel_pad(self, pad=0, system='pt', **kwargs):
         
@@ -148,6 +239,17 @@ class AxesPlus(Axes):
         text = TextMuliColor(*args, **kwargs)
         return text.draw()
 
+    def text_multicolor_batch(self, x, y, strings, **kwargs):
+        """
+        Add many multicolour labels, sharing their highlight map, as a single
+        artist. Takes the arguments of `text_multicolor`, with arrays of
+        x, y and a list of strings.
+        """
+        
+        kwargs.update(parent=self)
+        text = TextMuliColorBatch(x, y, strings, **kwargs)
+        return text.draw()
+
 import matplotlib.projections as proj
 proj.register_projection(AxesPlus)
 
@@ -0,0 +1,193 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+import io
+import os
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from matplotlib import rcParams
+
+ExportResult = namedtuple('ExportResult', ['index', 'paths', 'error'])
+
+################################################
+### Workers
+
+def _init_worker(backend='agg', initializer=None, initargs=()):
+    """
+    Set up a worker process once: import matplotlib and the figure classes
+    with a non-interactive backend, and warm the font and metric caches, so
+    the figures it renders only pay for their own drawing.
+    """
+
+    import matplotlib
+    matplotlib.use(backend)
+
+    import matplotlib.pyplot
+    from matplotlib.font_manager import FontProperties, findfont
+
+    from . import figure, text
+    from .metrics import metric_cache, get_headless_renderer
+
+    prop = FontProperties()
+    findfont(prop)
+    metric_cache.get_text_width_height_descent(get_headless_renderer(72), "lp", prop)
+
+    if initializer is not None:
+        initializer(*initargs)
+
+def _normalise_paths(paths):
+    """Return paths as a list of (path, savefig kwargs) pairs"""
+
+    if isinstance(paths, (str, bytes)) or hasattr(paths, '__fspath__'):
+        paths = [paths]
+
+    return [path if isinstance(path, tuple) else (path, {}) for path in paths]
+
+def _render(index, build, paths):
+    """Build one figure, save it to each path, and close it"""
+
+    import matplotlib.pyplot as plt
+
+    saved = []
+    try:
+        fig = build()
+        try:
+            for path, kwargs in paths:
+                fig.savefig(path, **kwargs)
+                saved.append(path)
+        finally:
+            plt.close(fig)
+    except Exception:
+        return ExportResult(index, saved, traceback.format_exc())
+
+    return ExportResult(index, saved, None)
+
+################################################
+### Functions
+
+# Raster formats written straight from an Agg pixel buffer, as
+# FigureCanvasAgg.print_png / print_tif do
+_RASTER_FORMATS = ['png', 'tif', 'tiff']
+
+def _write_raster(path, fmt, buffer, dpi):
+
+    if fmt == 'png':
+        import matplotlib.image as mimage
+        mimage.imsave(path, buffer, format='png', origin='upper', dpi=dpi)
+    else:
+        from PIL import Image
+        Image.fromarray(buffer).save(path, format='tiff', dpi=(dpi, dpi))
+
+def _render_raster(fig, dpi, **kwargs):
+    """Draw the figure once with Agg, as savefig would, and return its pixels"""
+
+    width = int(fig.get_figwidth() * dpi)
+
+    with io.BytesIO() as buffer:
+        fig.savefig(buffer, format='raw', dpi=dpi, **kwargs)
+        return np.frombuffer(buffer.getvalue(), np.uint8).reshape(-1, width, 4)
+
+def export_figure(fig, paths, dpis=None, **kwargs):
+    """
+    Save a figure to several files in one call.
+
+    Only raster outputs sharing a dpi (PNG and TIFF) are drawn once, and
+    written from the same pixels. Every other output, vector formats
+    included, is drawn separately by its own savefig call, so e.g. an SVG
+    and a PNG cost the same as two savefig calls.
+
+    Parameters
+    ----------
+    paths : list of str
+        The format of each file is taken from its extension.
+    dpis : float or list, optional
+        One dpi for all the files, or one per file (None for the savefig
+        default).
+    **kwargs
+        Passed to savefig. Arguments other than facecolor and edgecolor (e.g.
+        bbox_inches) save every file with savefig.
+
+    Returns
+    -------
+    The list of paths.
+    """
+
+    if isinstance(paths, (str, bytes)) or hasattr(paths, '__fspath__'):
+        paths = [paths]
+    if (dpis is None) or np.isscalar(dpis):
+        dpis = [dpis] * len(paths)
+    if len(dpis) != len(paths):
+        raise Exception('There must be one dpi for each path')
+
+    default_dpi = rcParams['savefig.dpi']
+    if default_dpi == 'figure':
+        default_dpi = getattr(fig, '_original_dpi', fig.dpi)
+    dpis = [default_dpi if dpi is None else dpi for dpi in dpis]
+
+    fmts = [os.path.splitext(os.fspath(path))[1][1:].lower() for path in paths]
+    raster_dpis = [dpi for fmt, dpi in zip(fmts, dpis) if fmt in _RASTER_FORMATS]
+    shared = set(kwargs) <= {'facecolor', 'edgecolor'} and not rcParams['savefig.bbox']
+
+    buffers = {}
+    for path, fmt, dpi in zip(paths, fmts, dpis):
+        if shared and (fmt in _RASTER_FORMATS) and (raster_dpis.count(dpi) > 1):
+            if dpi not in buffers:
+                buffers[dpi] = _render_raster(fig, dpi, **kwargs)
+            _write_raster(path, fmt, buffers[dpi], dpi)
+        else:
+            fig.savefig(path, dpi=dpi, **kwargs)
+
+    return paths
+
+def export_batch(jobs, processes=None, backend='agg', initializer=None, initargs=()):
+    """
+    Build and save many figures in parallel, across a pool of processes.
+
+    Each worker imports matplotlib and warms its font and metric caches
+    once, then renders figures until the jobs run out.
+
+    Parameters
+    ----------
+    jobs : iterable of (build, paths)
+        build is a picklable callable taking no arguments and returning a
+        figure (a module-level function, or a functools.partial of one
+        with the figure's spec as arguments). paths is a path, or a list of
+        paths or of (path, savefig kwargs) pairs, e.g.
+        [('fig.svg', {}), ('fig.png', {'dpi': 450})].
+    processes : int, optional
+        Number of worker processes, by default the number of CPUs.
+    backend : str
+        Matplotlib backend of the workers.
+    initializer, initargs
+        Extra set-up run once in each worker, e.g. to set rcParams or
+        register fonts.
+
+    Returns
+    -------
+    list of ExportResult(index, paths, error), in the order of the jobs,
+    with the paths that were saved, and error the formatted traceback if
+    building or saving the figure failed (None otherwise). A failing figure
+    does not stop the others.
+    """
+
+    jobs = [(build, _normalise_paths(paths)) for build, paths in jobs]
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(backend, initializer, initargs)) as pool:
+        futures = [pool.submit(_render, i, build, paths) for i, (build, paths) in enumerate(jobs)]
+
+        results = []
+        for i, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception:
+                # The job could not be sent to or run in a worker at all
+                results.append(ExportResult(i, [], traceback.format_exc()))
+
+    return results
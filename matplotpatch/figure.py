@@ -4,11 +4,15 @@
 
 import numpy as np
 
-from matplotlib.figure import Figure
+from matplotlib.figure import Figure, _stale_figure_callback
 import matplotlib.lines as mlines
 
 from .axes import decorator_axes
-from .text import TextMuliColor
+from .grid import DotGrid, BaselineGrid
+from .guides import GuideLayer
+from .export import export_figure
+from .layout import get_layout_geometry, snap_to_baseline
+from .text import TextPlus, TextMuliColor, TextMuliColorBatch
 from .transforms import transform_factory, decorator_custom_transform
 
 ################################################
@@ -23,6 +27,8 @@ class FigurePlus(Figure):
         super().__init__(*args, **kwargs)
         
         self._dotgrid = None     
+        self._baseline_grid = None
+        self._guides = GuideLayer(self)
 
     @decorator_axes
     def add_axes(self, *args, **kwargs):
@@ -33,14 +39,35 @@ class FigurePlus(Figure):
         return super().add_subplot(*args, **kwargs)
     
     @decorator_custom_transform
-    def text(self, *args, **kwargs):
-        return super().text(*args, **kwargs)
+    def text(self, x, y, s, fontdict=None, **kwargs):
+        
+        # As Figure.text, but building a TextPlus
+        effective_kwargs = {
+            'transform': self.transFigure,
+            **(fontdict if fontdict is not None else {}),
+            **kwargs,
+        }
+        text = TextPlus(x=x, y=y, text=s, **effective_kwargs)
+        text.set_figure(self)
+        text.stale_callback = _stale_figure_callback
+        
+        self.texts.append(text)
+        text._remove_method = self.texts.remove
+        self.stale = True
+        return text
     
     @decorator_custom_transform
-    def line(self, *args, **kwargs):
+    def line(self, *args, guide=False, **kwargs):
+        """
+        Add a line to the figure. Guide lines are drawn by the guide layer,
+        underneath the content, and cached between draws.
+        """
         
         line = mlines.Line2D(*args, **kwargs)
-        self.lines.append(line)
+        if guide:
+            self.get_guide_layer().add_guide(line)
+        else:
+            self.lines.append(line)
         
         return line
     
@@ -53,43 +80,114 @@ class FigurePlus(Figure):
         text = TextMuliColor(*args, **kwargs)
         return text.draw()
 
-    def draw_dotgrid(self, system='inch', interval=1, **kwargs):
-        
-        kwargs = {
-            'c': (0.8,0.8,0.8),
-            'lw': 0,
-            'marker': '.',
-            'ms': 1,
-            'zorder': -1,
-            **kwargs,
-        }
+    def text_multicolor_batch(self, x, y, strings, **kwargs):
+        """
+        Add many multicolour labels, sharing their highlight map, as a single
+        artist. Takes the arguments of `text_multicolor`, with arrays of
+        x, y and a list of strings.
+        """
         
-        trans = transform_factory(self, system=system)
-
-        bbox = self.bbox._points
-        coords = trans.inverted().transform(bbox)
-        string = f"""Transformation has units: 
-            (Horizontal) {coords[0,0]} --> {coords[1,0]} 
-            (Vertical)   {coords[0,1]} --> {coords[1,1]}"""
-        print(string)
-
-        x = np.arange(*coords[:,0], interval)[1:]
-        y = np.arange(*coords[:,1], interval)[1:]
-
-        line_x = np.tile(x,len(y))
-        line_y = np.repeat(y, len(x))
+        kwargs.update(parent=self)
+        text = TextMuliColorBatch(x, y, strings, **kwargs)
+        return text.draw()
 
-        self._dotgrid = mlines.Line2D(line_x, line_y, transform=trans, figure=self, **kwargs)
-        self.lines.append(self._dotgrid)
-        self.hide_dotgrid()
+    def draw_dotgrid(self, system='inch', interval=1, levels=None, **kwargs):
+        """
+        Add a grid of dots to the figure, hidden until `show_dotgrid`.
+        
+        levels is a list of dicts, each with a 'system', an 'interval' and
+        the style arguments of `DotGrid.add_level`, drawn in order. By
+        default a single level is drawn, every interval units of system and
+        styled with kwargs.
+        """
+        
+        if levels is None:
+            levels = [dict(system=system, interval=interval, **kwargs)]
+        
+        guides = self.get_guide_layer()
+        if self._dotgrid is not None:
+            guides.remove_guide(self._dotgrid)
+        
+        self._dotgrid = DotGrid(self)
+        for level in levels:
+            level = dict(level)
+            trans = transform_factory(self, system=level.pop('system', 'inch'))
+            self._dotgrid.add_level(trans, **level)
+            
+        guides.add_guide(self._dotgrid, visible=False)
         
     def show_dotgrid(self, *args, **kwargs):
         if self._dotgrid is None:
             self.draw_dotgrid(*args, **kwargs)
         
-        self._dotgrid.set_visible(True)
+        self.get_guide_layer().set_guide_visible(self._dotgrid, True)
         
     def hide_dotgrid(self):
-        self._dotgrid.set_visible(False)
+        if self._dotgrid is not None:
+            self.get_guide_layer().set_guide_visible(self._dotgrid, False)
+        
+    def draw_baseline_grid(self, system='pt', interval=12, anchor='bl', **kwargs):
+        """
+        Add a baseline grid, rules every interval units of system, hidden
+        until `show_baseline_grid`. kwargs are passed to `BaselineGrid`.
+        """
+        
+        guides = self.get_guide_layer()
+        if self._baseline_grid is not None:
+            guides.remove_guide(self._baseline_grid)
+        
+        trans = transform_factory(self, system=system, anchor=anchor)
+        self._baseline_grid = BaselineGrid(self, trans, interval=interval, **kwargs)
+        guides.add_guide(self._baseline_grid, visible=False)
+        
+    def show_baseline_grid(self, *args, **kwargs):
+        if self._baseline_grid is None:
+            self.draw_baseline_grid(*args, **kwargs)
+        
+        self.get_guide_layer().set_guide_visible(self._baseline_grid, True)
+        
+    def hide_baseline_grid(self):
+        if self._baseline_grid is not None:
+            self.get_guide_layer().set_guide_visible(self._baseline_grid, False)
+        
+    def get_guide_layer(self):
+        """
+        Return the `GuideLayer` drawing the guides of the figure underneath
+        its content, adding it again if the figure was cleared.
+        """
+        
+        if self._guides not in self.artists:
+            for artist in self._guides.get_artists():
+                self.add_artist(artist)
+        
+        return self._guides
+
+    def get_layout_geometry(self, system='pt', anchor='bl', format='records'):
+        """
+        Return the geometry of the figure's text, axes and dotgrid, laid out
+        without drawing. See `matplotpatch.layout.get_layout_geometry`.
+        """
+        
+        return get_layout_geometry(self, system=system, anchor=anchor, format=format)
+        
+    def snap_to_baseline(self, system=None, interval=None, anchor='bl', linespacing=True):
+        """
+        Move the figure's text onto its baseline grid, and return the texts
+        that were moved. See `matplotpatch.layout.snap_to_baseline`.
+        """
+        
+        return snap_to_baseline(self, system=system, interval=interval, anchor=anchor, linespacing=linespacing)
+        
+    def export(self, paths, dpis=None, **kwargs):
+        """
+        Save the figure to several files in one call. Only raster files
+        sharing a dpi (PNG and TIFF) are drawn once; every other file,
+        vector formats included, is drawn separately. See
+        `matplotpatch.export.export_figure`.
+        
+            fig.export(['figure.png', 'figure.tif'], dpis=450)
+        """
+        
+        return export_figure(self, paths, dpis=dpis, **kwargs)
     
     
@@ -0,0 +1,280 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+from collections import namedtuple
+
+import numpy as np
+
+import matplotlib.cbook as cbook
+from matplotlib import rcParams
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.backends.backend_agg import RendererAgg
+from matplotlib.colors import to_rgba
+from matplotlib.markers import MarkerStyle
+from matplotlib.path import Path
+from matplotlib.transforms import Bbox, IdentityTransform
+
+################################################
+### Classes
+
+GridLevel = namedtuple('GridLevel', ['transform', 'interval', 'color', 'size', 'marker', 'edgewidth'])
+
+class DotGrid(Artist):
+    """
+    Artist drawing one or more grids of dots over the figure.
+
+    Each level is a grid of its own, with its own transform, interval and
+    style, so a point grid can sit under a pica grid under an inch grid.
+    Dot positions are computed from the live transforms at draw time, and
+    only inside the visible region, so nothing is stored and the grid
+    follows resizes and dpi changes. Dots are drawn with `draw_markers`,
+    which stamps a single marker (a cached image in Agg, a reused object in
+    vector backends) at every position. By default they look like the
+    markers of the Line2D the dotgrid used to be.
+
+    With min_spacing, raster renderers skip the levels whose dots would be
+    closer than min_spacing pixels. Vector renderers always draw every
+    level, since the output can be zoomed.
+    """
+
+    zorder = -1
+
+    def __init__(self, figure, min_spacing=0, **kwargs):
+        super().__init__()
+
+        self.set_figure(figure)
+        self.min_spacing = min_spacing
+        self._levels = []
+
+        self.update(kwargs)
+
+    def add_level(self, transform, interval=1, **kwargs):
+        """
+        Add a grid of dots every `interval` units of `transform`.
+
+        Parameters
+        ----------
+        color (c) : color, default (0.8, 0.8, 0.8)
+        size (markersize, ms) : float, default 1
+            Size of the dots, in points.
+        marker : str, default '.'
+        edgewidth (markeredgewidth, mew) : float, default rcParams['lines.markeredgewidth']
+            Width of the outline of the dots, in points, drawn in color.
+        alpha : float, optional
+        """
+
+        kwargs = cbook.normalize_kwargs(kwargs, {'color': ['c'], 'size': ['markersize', 'ms'],
+                                                 'edgewidth': ['markeredgewidth', 'mew']})
+
+        # Line-only properties of the old Line2D dotgrid have no meaning here
+        kwargs.pop('lw', None)
+        kwargs.pop('linewidth', None)
+
+        color = to_rgba(kwargs.pop('color', (0.8,0.8,0.8)), kwargs.pop('alpha', None))
+        size = kwargs.pop('size', 1)
+        marker = MarkerStyle(kwargs.pop('marker', '.'))
+        edgewidth = kwargs.pop('edgewidth', rcParams['lines.markeredgewidth'])
+        if kwargs:
+            raise Exception(f'Invalid arguments for a grid level: {", ".join(kwargs)}')
+
+        level = GridLevel(transform, interval, color, size, marker, edgewidth)
+        self._levels.append(level)
+        self.stale = True
+
+        return level
+
+    def get_levels(self):
+        return list(self._levels)
+
+    def clear_levels(self):
+        self._levels = []
+        self.stale = True
+
+    def _get_visible_bbox(self):
+
+        bbox = self.figure.bbox
+        clip_box = self.get_clip_box()
+        if clip_box is not None:
+            bbox = Bbox.intersection(bbox, clip_box)
+
+        return bbox
+
+    def _get_min_spacing(self, renderer):
+        """Return the spacing under which levels are skipped, for renderer"""
+
+        if isinstance(renderer, RendererAgg):
+            return self.min_spacing
+
+        return 0
+
+    def _get_offsets(self, level, bbox, min_spacing=0):
+        """Return the display positions of the dots of level strictly inside bbox"""
+
+        origin = level.transform.transform((0, 0))
+        step = level.transform.transform((level.interval, level.interval)) - origin
+
+        if (bbox is None) or np.any(step == 0) or np.any(np.abs(step) < min_spacing):
+            return np.empty((0, 2))
+
+        # Grid indices of the bbox corners, in increasing order
+        lo = (bbox.min - origin) / step
+        hi = (bbox.max - origin) / step
+        first = np.floor(np.minimum(lo, hi)) + 1
+        last = np.ceil(np.maximum(lo, hi)) - 1
+
+        x = origin[0] + np.arange(first[0], last[0] + 1) * step[0]
+        y = origin[1] + np.arange(first[1], last[1] + 1) * step[1]
+
+        xx, yy = np.meshgrid(x, y)
+        return np.column_stack([xx.ravel(), yy.ravel()])
+
+    def get_window_extent(self, renderer=None):
+
+        bbox = self._get_visible_bbox()
+        min_spacing = self._get_min_spacing(renderer)
+        offsets = [self._get_offsets(level, bbox, min_spacing) for level in self._levels]
+        offsets = [points for points in offsets if len(points)]
+        if not offsets:
+            return Bbox.null()
+
+        points = np.concatenate(offsets)
+        return Bbox([points.min(axis=0), points.max(axis=0)])
+
+    @allow_rasterization
+    def draw(self, renderer):
+
+        if not self.get_visible():
+            return
+
+        renderer.open_group('dotgrid', self.get_gid())
+
+        bbox = self._get_visible_bbox()
+        min_spacing = self._get_min_spacing(renderer)
+        for level in self._levels:
+            offsets = self._get_offsets(level, bbox, min_spacing)
+            if not len(offsets):
+                continue
+
+            # As Line2D draws its markers, outlined in the face colour
+            gc = renderer.new_gc()
+            self._set_gc_clip(gc)
+            gc.set_linewidth(level.edgewidth)
+            gc.set_antialiased(rcParams['lines.antialiased'])
+            gc.set_foreground(level.color, isRGBA=True)
+            if self.get_alpha() is not None:
+                gc.set_alpha(self.get_alpha())
+
+            marker = level.marker
+            w = renderer.points_to_pixels(level.size)
+            snap = marker.get_snap_threshold()
+            if snap is not None:
+                snap = w >= snap
+            gc.set_snap(snap)
+            gc.set_joinstyle(marker.get_joinstyle())
+            gc.set_capstyle(marker.get_capstyle())
+
+            marker_trans = marker.get_transform()
+            if marker.get_marker() == ',':
+                gc.set_linewidth(0)
+            else:
+                marker_trans = marker_trans.scale(w, w)
+
+            renderer.draw_markers(gc, marker.get_path(), marker_trans,
+                                  Path(offsets), IdentityTransform(), level.color)
+            gc.restore()
+
+        renderer.close_group('dotgrid')
+        self.stale = False
+
+class BaselineGrid(Artist):
+    """
+    Artist drawing horizontal rules every `interval` units of a transform,
+    across the figure, as a baseline grid to set text on.
+
+    Like `DotGrid`, the rules are computed from the live transform at draw
+    time, and only inside the visible region.
+    """
+
+    zorder = -1
+
+    def __init__(self, figure, transform, interval=1, color=(0.6,0.8,1.0), linewidth=0.5, alpha=None, **kwargs):
+        super().__init__()
+
+        self.set_figure(figure)
+        self._grid_transform = transform
+        self.interval = interval
+        self._color = to_rgba(color, alpha)
+        self._linewidth = linewidth
+
+        self.update(kwargs)
+
+    def get_grid_transform(self):
+        return self._grid_transform
+
+    def _get_visible_bbox(self):
+
+        bbox = self.figure.bbox
+        clip_box = self.get_clip_box()
+        if clip_box is not None:
+            bbox = Bbox.intersection(bbox, clip_box)
+
+        return bbox
+
+    def get_baselines(self, bbox=None):
+        """Return the display y of the rules strictly inside bbox (by default the visible region)"""
+
+        if bbox is None:
+            bbox = self._get_visible_bbox()
+
+        origin = self._grid_transform.transform((0, 0))[1]
+        step = self._grid_transform.transform((0, self.interval))[1] - origin
+
+        if (bbox is None) or (step == 0):
+            return np.empty(0)
+
+        lo, hi = sorted([(bbox.y0 - origin) / step, (bbox.y1 - origin) / step])
+        return origin + np.arange(np.floor(lo) + 1, np.ceil(hi)) * step
+
+    def get_window_extent(self, renderer=None):
+
+        bbox = self._get_visible_bbox()
+        y = self.get_baselines(bbox)
+        if not len(y):
+            return Bbox.null()
+
+        return Bbox([[bbox.x0, y.min()], [bbox.x1, y.max()]])
+
+    @allow_rasterization
+    def draw(self, renderer):
+
+        if not self.get_visible():
+            return
+
+        bbox = self._get_visible_bbox()
+        y = self.get_baselines(bbox)
+        if not len(y):
+            return
+
+        renderer.open_group('baselinegrid', self.get_gid())
+
+        # One path of disjoint segments for all the rules
+        vertices = np.empty((2 * len(y), 2))
+        vertices[0::2, 0] = bbox.x0
+        vertices[1::2, 0] = bbox.x1
+        vertices[:, 1] = np.repeat(y, 2)
+        codes = np.tile([Path.MOVETO, Path.LINETO], len(y))
+
+        gc = renderer.new_gc()
+        self._set_gc_clip(gc)
+        gc.set_linewidth(self._linewidth)
+        gc.set_foreground(self._color, isRGBA=True)
+        if self.get_alpha() is not None:
+            gc.set_alpha(self.get_alpha())
+
+        renderer.draw_path(gc, Path(vertices, codes), IdentityTransform())
+        gc.restore()
+
+        renderer.close_group('baselinegrid')
+        self.stale = False
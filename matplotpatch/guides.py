@@ -0,0 +1,281 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+import numpy as np
+
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.backends.backend_agg import RendererAgg
+from matplotlib.figure import _stale_figure_callback
+
+################################################
+### Functions
+
+def _get_nonzero_slices(alpha):
+    """Return the (rows, columns) slices bounding the nonzero values of alpha"""
+
+    rows = np.nonzero(alpha.any(axis=1))[0]
+    cols = np.nonzero(alpha.any(axis=0))[0]
+    if not len(rows):
+        return slice(0, 0), slice(0, 0)
+
+    return slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1)
+
+################################################
+### Classes
+
+class GuideLayer(Artist):
+    """
+    Artist drawing the typographic guides of a figure (dotgrid, baseline
+    grid, guide lines) underneath its content.
+
+    When an Agg canvas draws the figure (not when saving it), each guide is
+    rendered once, cropped to its pixels, and later draws only composite the
+    cropped images. An image is only rendered again when the canvas size or
+    dpi change, or when its guide is modified.
+
+    Once a guide has been shown or hidden after such a draw, the content
+    drawn above the guides is also kept, as a transparent layer, along with
+    the background under them (this adds about a fifth to the draw).
+    Showing or hiding a guide then composites background, guides and
+    content again and blits the result, without drawing the figure. Where
+    semi-transparent content (e.g. antialiased edges) lies over the guides
+    or the background, blending it as a layer can round a channel one
+    level away from a direct draw; the canvas is otherwise identical.
+    Saving, and vector renderers, draw the guides directly and keep
+    nothing.
+    """
+
+    zorder = -10
+
+    def __init__(self, figure):
+        super().__init__()
+
+        self.set_figure(figure)
+        self.stale_callback = _stale_figure_callback
+        self._guides = []
+        self._hidden = set()
+        self._images = {}
+
+        self._end = _ContentEnd(self)
+        self._drawn = False
+        self._layered = False
+        self._capture = None
+        self._composite = None
+
+    def get_artists(self):
+        """
+        Return the artists to add to the figure: the layer, and the artist
+        that ends the content layer, drawn after everything else.
+        """
+        return [self, self._end]
+
+    def add_guide(self, artist, visible=True):
+        """Add an artist to the layer, and return it"""
+
+        artist.set_figure(self.figure)
+        artist.stale_callback = self._stale_guide_callback
+        self._guides.append(artist)
+        if not visible:
+            self._hidden.add(artist)
+
+        self.stale = True
+        return artist
+
+    def remove_guide(self, artist):
+
+        self._guides.remove(artist)
+        self._hidden.discard(artist)
+        self._images.pop(artist, None)
+        artist.stale_callback = None
+        self.stale = True
+
+    def get_guides(self):
+        return list(self._guides)
+
+    def set_guide_visible(self, artist, visible):
+        """
+        Show or hide a guide. If the figure was drawn on an Agg canvas and
+        nothing else changed since, the canvas is composited again and
+        blitted rather than redrawn.
+        """
+
+        if self.get_guide_visible(artist) == visible:
+            return
+
+        if visible:
+            self._hidden.discard(artist)
+        else:
+            self._hidden.add(artist)
+
+        if not self._recomposite():
+            self._layered = self._drawn
+            self.stale = True
+
+    def get_guide_visible(self, artist):
+        return (artist in self._guides) and (artist not in self._hidden)
+
+    def _stale_guide_callback(self, artist, val):
+
+        if val:
+            self._images.pop(artist, None)
+            self.stale = True
+
+    def _get_key(self, renderer):
+
+        width, height = renderer.get_canvas_width_height()
+        return int(width), int(height), renderer.dpi
+
+    def _get_image(self, artist, renderer):
+        """
+        Return the (x, y, image) of artist rendered on its own, as passed to
+        `draw_image`, cropped to its non-transparent pixels.
+        """
+
+        key = self._get_key(renderer)
+
+        entry = self._images.get(artist)
+        if (entry is not None) and (entry[0] == key):
+            return entry[1]
+
+        width, height, dpi = key
+        offscreen = RendererAgg(width, height, dpi)
+        artist.draw(offscreen)
+
+        img = np.asarray(offscreen.buffer_rgba())
+        slice_y, slice_x = _get_nonzero_slices(img[..., 3])
+
+        # Only the crop is kept; draw_image takes rows bottom to top
+        image = (slice_x.start, height - slice_y.stop, img[slice_y, slice_x][::-1].copy())
+        self._images[artist] = (key, image)
+
+        return image
+
+    def clear_buffers(self):
+        self._images.clear()
+        self._composite = None
+        self.stale = True
+
+    def _get_visible_guides(self):
+
+        guides = [guide for guide in self._guides if guide not in self._hidden]
+        guides.sort(key=lambda guide: guide.get_zorder())
+
+        return guides
+
+    def _draw_images(self, renderer):
+
+        for guide in self._get_visible_guides():
+            x, y, image = self._get_image(guide, renderer)
+            if not image.size:
+                continue
+
+            gc = renderer.new_gc()
+            renderer.draw_image(gc, x, y, image)
+            gc.restore()
+
+    def _is_cached(self, renderer):
+        """Return whether guides are drawn from cached images on renderer"""
+
+        canvas = self.figure.canvas
+        return isinstance(renderer, RendererAgg) and not canvas.is_saving()
+
+    def _is_content_stale(self):
+        """Return whether the figure changed since it was drawn"""
+
+        fig = self.figure
+        artists = [fig.patch, *fig.artists, *fig.lines, *fig.patches, *fig.texts, *fig.images, *fig.legends]
+
+        return fig.stale or any(artist.stale for artist in artists if artist is not self)
+
+    def _end_content(self, renderer):
+        """
+        Keep the content drawn since `draw` started the content layer, and
+        composite it on the canvas.
+        """
+
+        if (self._capture is None) or (self._capture[0] is not renderer):
+            return
+
+        _, background = self._capture
+        self._capture = None
+
+        img, (l, b, w, h) = renderer.tostring_rgba_minimized()
+        content = None
+        if (w > 0) and (h > 0):
+            content = (l, int(renderer.height) - b - h, img[::-1])
+
+        renderer.stop_filter(lambda image, dpi: (img, 0, 0))
+        self._composite = (renderer, self._get_key(renderer), background, content)
+
+    def _recomposite(self):
+        """
+        Composite the kept background, the visible guides and the kept
+        content on the canvas, and blit it. Return False if the canvas has
+        to be drawn instead.
+        """
+
+        if (self._composite is None) or self._is_content_stale():
+            return False
+
+        renderer, key, background, content = self._composite
+        canvas = self.figure.canvas
+        if (getattr(canvas, 'renderer', None) is not renderer) or (self._get_key(renderer) != key):
+            return False
+
+        renderer.restore_region(background)
+        self._draw_images(renderer)
+        if content is not None:
+            gc = renderer.new_gc()
+            renderer.draw_image(gc, *content)
+            gc.restore()
+
+        canvas.blit(self.figure.bbox)
+        return True
+
+    @allow_rasterization
+    def draw(self, renderer):
+
+        self._composite = None
+        if not self.get_visible():
+            return
+
+        renderer.open_group('guides', self.get_gid())
+
+        if self._is_cached(renderer):
+            self._drawn = True
+            background = renderer.copy_from_bbox(self.figure.bbox)
+            self._draw_images(renderer)
+
+            # Draw the rest of the figure on a layer of its own, kept by
+            # _end_content once everything else is drawn
+            if self._layered and self._guides and (self._end in self.figure.artists):
+                renderer.start_filter()
+                self._capture = (renderer, background)
+        else:
+            for guide in self._get_visible_guides():
+                guide.draw(renderer)
+
+        renderer.close_group('guides')
+        self.stale = False
+
+class _ContentEnd(Artist):
+    """
+    Artist drawn after every other artist of the figure, ending the content
+    layer of its `GuideLayer`.
+    """
+
+    zorder = float('inf')
+
+    def __init__(self, layer):
+        super().__init__()
+        self._layer = layer
+
+    def get_window_extent(self, renderer=None):
+        from matplotlib.transforms import Bbox
+        return Bbox.null()
+
+    def draw(self, renderer):
+        self._layer._end_content(renderer)
+        self.stale = False
@@ -0,0 +1,36 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+import sys
+
+import matplotlib.text as mtext
+
+# Modules that bind matplotlib.text.Text by name at import time. Everything
+# else looks the class up as `mtext.Text` whenever it builds a text.
+TEXT_MODULES = ['matplotlib.figure', 'matplotlib.pyplot', 'matplotlib.table']
+
+################################################
+### Functions
+
+def install_text_class(cls):
+    """
+    Make cls the Text class Matplotlib builds its text with, and return the
+    class it replaces.
+
+    `matplotlib.text.Text` is replaced, and so is the name in the already
+    loaded modules of TEXT_MODULES that still refer to the replaced class.
+    Modules loaded later import the new class anyway. No module is reloaded,
+    so Figure, Axes and the other classes keep their identity.
+    """
+
+    previous = mtext.Text
+    mtext.Text = cls
+
+    for name in TEXT_MODULES:
+        module = sys.modules.get(name)
+        if (module is not None) and (getattr(module, 'Text', None) is previous):
+            module.Text = cls
+
+    return previous
@@ -0,0 +1,289 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+import json
+import weakref
+
+import numpy as np
+
+from matplotlib.text import _wrap_text
+
+from .metrics import get_headless_renderer
+from .transforms import transform_factory
+
+################################################
+### Functions
+
+LAYOUT_DTYPE = np.dtype([
+    ('kind', 'U9'),
+    ('parent', int),
+    ('text', object),
+    ('x0', float),
+    ('y0', float),
+    ('x1', float),
+    ('y1', float),
+    ('baseline', float),
+])
+
+def _get_texts(fig):
+    """
+    Yield (kind, parent, text) for every text of the figure that would be
+    drawn, with parent the index of the owning axes (-1 for the figure).
+    """
+
+    for text in fig.texts:
+        yield 'text', -1, text
+
+    for i, ax in enumerate(fig.axes):
+        for text in ax.texts:
+            yield 'text', i, text
+
+        for title in [ax.title, ax._left_title, ax._right_title]:
+            yield 'title', i, title
+
+        for axis in [ax.xaxis, ax.yaxis]:
+            yield 'label', i, axis.label
+
+            # Positions and formats the labels as a draw would
+            for tick in axis._update_ticks():
+                for label in [tick.label1, tick.label2]:
+                    yield 'ticklabel', i, label
+
+def _get_text_geometry(text, renderer):
+    """
+    Return the display-space bbox and first baseline of text, as drawn.
+    """
+
+    # Wrapping measures with text._renderer, so lend it the renderer for
+    # the query only: left in place, later get_window_extent calls would
+    # measure with it rather than the canvas
+    previous = text._renderer
+    text._renderer = renderer
+    try:
+        with _wrap_text(text) as textobj:
+            bbox, info, descent = textobj._get_layout(renderer)
+            x, y = textobj.get_transform().transform(textobj.get_unitless_position())
+    finally:
+        text._renderer = previous
+
+    baseline = y + info[0][3]
+
+    return bbox.translated(x, y), baseline
+
+def get_layout_geometry(fig, system='pt', anchor='bl', format='records', factory=transform_factory):
+    """
+    Lay out a figure without drawing it and return the geometry of its text,
+    axes and dotgrid.
+
+    Text is measured from the font files (see `HeadlessRenderer`), so no
+    canvas or pixel buffer is needed.
+
+    Parameters
+    ----------
+    fig : Figure
+    system : str
+        Coordinate system of the output, anchored on the figure.
+    anchor : str
+        Anchor of the coordinate system.
+    format : {'records', 'json'}
+        Return a NumPy record array, or a JSON string of a list of objects.
+    factory : callable
+        Builds the transform of system, called as
+        factory(fig, system=system, anchor=anchor), e.g. mpltypo's
+        GetTransform. By default `transform_factory`.
+
+    Returns
+    -------
+    Records with fields kind ('text', 'title', 'label', 'ticklabel', 'axes'
+    or 'dotgrid'), parent (axes index, -1 for the figure), text, the
+    bounding box x0, y0, x1, y1 and, for text, the first baseline.
+    """
+
+    renderer = get_headless_renderer(fig.dpi)
+
+    rows = []
+    boxes = []
+    baselines = []
+
+    for ax in fig.axes:
+        ax.apply_aspect()
+
+    for kind, parent, text in _get_texts(fig):
+        if not text.get_visible() or not text.get_text():
+            continue
+
+        bbox, baseline = _get_text_geometry(text, renderer)
+        rows.append((kind, parent, text.get_text()))
+        boxes.append(bbox.get_points())
+        baselines.append(baseline)
+
+    for i, ax in enumerate(fig.axes):
+        rows.append(('axes', i, ''))
+        boxes.append(fig.transFigure.transform(ax.get_position().get_points()))
+        baselines.append(np.nan)
+
+    dotgrid = getattr(fig, '_dotgrid', None)
+    guides = getattr(fig, '_guides', None)
+    if (dotgrid is not None) and (guides is not None) and guides.get_guide_visible(dotgrid):
+        rows.append(('dotgrid', -1, ''))
+        boxes.append(dotgrid.get_window_extent(renderer).get_points())
+        baselines.append(np.nan)
+
+    # Convert everything to the output system in one go
+    trans = factory(fig, system=system, anchor=anchor).inverted()
+    boxes = trans.transform(np.reshape(boxes, (-1, 2))).reshape(-1, 4)
+    baselines = trans.transform(np.column_stack([np.zeros(len(baselines)), baselines]))[:, 1]
+
+    records = np.empty(len(rows), dtype=LAYOUT_DTYPE)
+    for field, column in zip(['kind', 'parent', 'text'], zip(*rows)):
+        records[field] = column
+    for field, column in zip(['x0', 'y0', 'x1', 'y1'], boxes.T):
+        records[field] = column
+    records['baseline'] = baselines
+
+    if format == 'records':
+        return records.view(np.recarray)
+    elif format == 'json':
+        fields = records.dtype.names
+        data = [{field: _to_json(record[field]) for field in fields} for record in records]
+        return json.dumps(data)
+    else:
+        raise Exception(f"'{format}' is not a valid format")
+
+def _to_json(value):
+
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+
+    return value
+
+def _get_grid(fig, system, interval, anchor, factory):
+    """Return the transform and interval of the baseline grid to snap to"""
+
+    grid = getattr(fig, '_baseline_grid', None)
+    if (system is None) and (grid is not None):
+        trans = grid.get_grid_transform()
+        if interval is None:
+            interval = grid.interval
+    else:
+        trans = factory(fig, system=system or 'point', anchor=anchor)
+
+    if interval is None:
+        interval = 12
+
+    return trans, interval
+
+def _get_snap_state(text, dpi):
+    """
+    Return what the snapped position of text depends on. The anchor is
+    taken in points, so the state does not change with the dpi.
+    """
+
+    x, y = text.get_transform().transform(text.get_unitless_position())
+
+    return (text.get_text(), text.get_fontsize(), text._linespacing,
+            text.get_verticalalignment(), x * 72 / dpi, y * 72 / dpi)
+
+def snap_to_baseline(fig, system=None, interval=None, anchor='bl', linespacing=True, factory=transform_factory):
+    """
+    Move the text of a figure so each first baseline sits on the nearest
+    line of a baseline grid.
+
+    Parameters
+    ----------
+    fig : Figure
+    system, interval, anchor
+        The grid has a line every interval units of system, anchored on the
+        figure. By default the figure's baseline grid is used (see
+        `draw_baseline_grid`), or else a grid every 12pt.
+    linespacing : bool
+        Also round the line height (fontsize * linespacing) of multi-line
+        `TextPlus` to a multiple of the grid, so every line sits on it.
+    factory : callable
+        Builds the transform of system, as in `get_layout_geometry`.
+
+    Returns
+    -------
+    list of the texts that were moved.
+
+    Texts added with `text` (on the figure or its axes) are snapped; titles,
+    axis labels and tick labels, placed by Matplotlib itself, are not, nor
+    is rotated text. Texts already snapped are skipped until their string,
+    font size, line spacing, alignment or position change.
+    """
+
+    trans, interval = _get_grid(fig, system, interval, anchor, factory)
+    renderer = get_headless_renderer(fig.dpi)
+
+    cache = getattr(fig, '_snap_cache', None)
+    if cache is None:
+        cache = fig._snap_cache = weakref.WeakKeyDictionary()
+
+    for ax in fig.axes:
+        ax.apply_aspect()
+
+    # Only the texts added with `text`: going through _get_texts would lay
+    # out the ticks of every axis for nothing
+    texts = []
+    for text in [*fig.texts, *(text for ax in fig.axes for text in ax.texts)]:
+        if not text.get_visible() or not text.get_text():
+            continue
+        if text.get_rotation() != 0:
+            continue
+        if cache.get(text) == _get_snap_state(text, fig.dpi):
+            continue
+        texts.append(text)
+
+    if not texts:
+        return []
+
+    origin = trans.transform((0, 0))[1]
+    step = trans.transform((0, interval))[1] - origin
+
+    # Only texts laid out on fontsize * linespacing (TextPlus and SpacedText)
+    # have line heights that can be made a multiple of the grid
+    if linespacing:
+        step_pt = abs(step) * 72 / fig.dpi
+        spaced = [text for text in texts if hasattr(type(text), '_layout_cache')]
+
+        fs = np.array([text.get_fontsize() for text in spaced])
+        ls = np.array([text._linespacing for text in spaced])
+        lines = np.maximum(1, np.round(fs * ls / step_pt))
+        new_ls = lines * step_pt / fs
+
+        for text, old, new in zip(spaced, ls, new_ls):
+            if not np.isclose(old, new):
+                text.set_linespacing(new)
+
+    # First baselines, and the nearest grid lines, in display space
+    baselines = np.array([_get_text_geometry(text, renderer)[1] for text in texts])
+    grid = (baselines - origin) / step
+    delta = origin + np.round(grid) * step - baselines
+
+    # Move the texts sharing a transform in a single pass
+    groups = {}
+    for i, text in enumerate(texts):
+        groups.setdefault(id(text.get_transform()), []).append(i)
+
+    moved = []
+    for indices in groups.values():
+        text_trans = texts[indices[0]].get_transform()
+        positions = np.array([texts[i].get_unitless_position() for i in indices], dtype=float)
+
+        display = text_trans.transform(positions)
+        display[:, 1] += delta[indices]
+        positions = text_trans.inverted().transform(display)
+
+        for i, position in zip(indices, positions):
+            if not np.isclose(delta[i], 0):
+                texts[i].set_position(position)
+                moved.append(texts[i])
+
+    for text in texts:
+        cache[text] = _get_snap_state(text, fig.dpi)
+
+    return moved
@@ -0,0 +1,75 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+import re
+from functools import lru_cache
+
+################################################
+### Functions
+
+@lru_cache(maxsize=32)
+def compile_flag(flag='[:]'):
+    """
+    Return the compiled (split, match) expressions for a markup flag.
+
+    A flag is three characters: the opening bracket, the separator between
+    the text and the highlight index, and the closing bracket, so the
+    default '[:]' marks up runs as '[text:0]'.
+    """
+
+    if not (isinstance(flag, str) and (len(flag) == 3)):
+        raise Exception("'flag' must be a string of 3 characters")
+
+    opn, sep, clo = map(re.escape, flag)
+
+    split = re.compile(f"({opn}.*?{clo})")
+    match = re.compile(f"{opn}(.*?){sep}(.*?){clo}")
+
+    return split, match
+
+@lru_cache(maxsize=1024)
+def parse_markup(template, flag='[:]'):
+    """
+    Parse a markup string into lines of (text, highlight) runs.
+
+    `highlight` is the integer index given in the markup, or None for text
+    outside of it. The result is cached per (template, flag), so repeated
+    templates are only parsed once.
+    """
+
+    split, match = compile_flag(flag)
+
+    lines = [[]]
+    for part in split.split(template):
+        fmt = None
+
+        p = match.fullmatch(part)
+        if p:
+            part, fmt = p.groups()
+            fmt = int(fmt)
+
+        rows = part.split('\n')
+        for i, row in enumerate(rows):
+            if i != 0:
+                lines.append([])
+
+            lines[-1].append((row, fmt))
+
+    return tuple(tuple(line) for line in lines)
+
+def fill_markup(template, flag='[:]', values=None):
+    """
+    Return the parsed runs of template, with the '{name}' placeholders of
+    each run filled in from values.
+    """
+
+    lines = parse_markup(template, flag)
+    if values is None:
+        return lines
+
+    return tuple(
+        tuple((text.format_map(values), fmt) for text, fmt in line)
+        for line in lines
+    )
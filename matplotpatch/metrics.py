@@ -0,0 +1,251 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+from collections import OrderedDict
+from functools import lru_cache
+
+from matplotlib import rcParams
+from matplotlib.backend_bases import RendererBase
+from matplotlib.backends.backend_agg import RendererAgg, get_hinting_flag
+from matplotlib.backends.backend_mixed import MixedModeRenderer
+from matplotlib.font_manager import findfont, get_font
+from matplotlib.mathtext import MathTextParser
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
+
+from .transforms import CacheInfo
+
+################################################
+### Classes
+
+class MetricCache(object):
+    """
+    Process-wide, size-bounded LRU cache of text extents.
+
+    Entries are keyed on (string, font file and size, dpi, math mode,
+    renderer type), so identical strings set in the same font are only
+    measured once, whichever Text instance asks for them. The font file is
+    the one the properties resolve to (see `get_font_key`), so entries do
+    not go stale when rcParams map a generic family to another font.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_text_width_height_descent(self, renderer, s, prop, ismath=False):
+        """
+        Return the (width, height, descent) of string `s`, in display units,
+        as measured by `renderer`.
+        """
+
+        # points_to_pixels folds in the dpi of raster renderers and is the
+        # identity for vector ones, which measure in points
+        dpi = renderer.points_to_pixels(72)
+        kind = get_renderer_key(renderer)
+        key = (s, get_font_key(prop), dpi, ismath, kind)
+        if ismath:
+            # Mathtext picks its own fonts from the family
+            key += (hash(prop),)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = renderer.get_text_width_height_descent(s, prop, ismath=ismath)
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, len(self._entries))
+
+metric_cache = MetricCache()
+
+# rcParams a Text built from keyword arguments takes its defaults from
+_STYLE_RCPARAMS = ['font.family', 'font.style', 'font.variant', 'font.weight',
+                   'font.stretch', 'font.size', 'text.color', 'text.usetex']
+
+class StyleCache(object):
+    """
+    Process-wide, size-bounded LRU cache of text styles.
+    
+    Text keyword arguments are resolved into a template `Text` (font
+    properties, colour, alpha...) once, so many labels sharing a style do
+    not each build a throwaway Text. Entries are keyed on the arguments and
+    on the rcParams a Text takes its defaults from, so a change to those
+    (or a style context) resolves the style again.
+    """
+    
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def __len__(self):
+        return len(self._entries)
+    
+    def get_style(self, kwargs):
+        """
+        Return the template `Text` for the keyword arguments. It is shared,
+        so must not be modified or drawn.
+        """
+        
+        key = (_freeze(kwargs), tuple(_freeze(rcParams[name]) for name in _STYLE_RCPARAMS))
+        
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        
+        self.misses += 1
+        entry = Text(0, 0, '', **kwargs)
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            
+        return entry
+    
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, len(self._entries))
+
+style_cache = StyleCache()
+
+class HeadlessRenderer(RendererBase):
+    """
+    Renderer that can only measure text, straight from the font files.
+    
+    Text is measured exactly as `RendererAgg` measures it, but no pixel
+    buffer (or canvas) is ever allocated, so layouts can be computed before,
+    or instead of, drawing the figure.
+    """
+    
+    # Measurements are interchangeable with Agg's in the metric cache
+    _metric_key = RendererAgg
+    
+    def __init__(self, dpi=72):
+        super().__init__()
+        self.dpi = dpi
+        self.mathtext_parser = MathTextParser('Agg')
+        
+    def flipy(self):
+        return False
+    
+    def points_to_pixels(self, points):
+        return points * self.dpi / 72
+    
+    def get_text_width_height_descent(self, s, prop, ismath):
+        
+        if ismath == 'TeX':
+            texmanager = self.get_texmanager()
+            fontsize = prop.get_size_in_points()
+            return texmanager.get_text_width_height_descent(
+                s, fontsize, renderer=self)
+        
+        if ismath:
+            ox, oy, width, height, descent, fonts, used_characters = \
+                self.mathtext_parser.parse(s, self.dpi, prop)
+            return width, height, descent
+        
+        font = get_font(findfont(prop))
+        font.clear()
+        font.set_size(prop.get_size_in_points(), self.dpi)
+        font.set_text(s, 0.0, flags=get_hinting_flag())
+        
+        # Sizes are in subpixels
+        w, h = font.get_width_height()
+        d = font.get_descent()
+        return w / 64.0, h / 64.0, d / 64.0
+
+@lru_cache(maxsize=16)
+def get_headless_renderer(dpi=72):
+    """Return a shared `HeadlessRenderer` for the given dpi"""
+    
+    return HeadlessRenderer(dpi)
+
+################################################
+### Functions
+
+def get_cache_info():
+    """
+    Return the hits, misses and size of the shared text caches, keyed on
+    'metrics' (renderer measurements) and 'styles' (resolved styles).
+    """
+
+    return {'metrics': metric_cache.cache_info(), 'styles': style_cache.cache_info()}
+
+def get_font_key(prop):
+    """
+    Return a hashable key of the font that FontProperties prop resolves to:
+    the font file and the size in points.
+    
+    Unlike hash(prop), which only sees the family names, it changes when
+    rcParams (e.g. font.sans-serif) make a generic family resolve to
+    another file.
+    """
+
+    return findfont(prop), prop.get_size_in_points()
+
+def get_renderer_key(renderer):
+    """
+    Return the renderer type text measured by renderer is interchangeable
+    with: the vector renderer behind a `MixedModeRenderer` (SVG, PDF, PS),
+    and Agg for the `HeadlessRenderer`.
+    """
+
+    if isinstance(renderer, MixedModeRenderer):
+        renderer = renderer._vector_renderer
+
+    return getattr(renderer, '_metric_key', type(renderer))
+
+def scale_layout(layout, factor):
+    """
+    Scale a (bbox, info, descent) layout from `Text._get_layout` by factor.
+    """
+
+    bbox, info, descent = layout
+
+    bbox = Bbox(bbox.get_points() * factor)
+    info = [(line, (w * factor, h * factor), x * factor, y * factor)
+            for line, (w, h), x, y in info]
+
+    return bbox, info, descent * factor
+
+def _freeze(value):
+    """Return a hashable stand-in for (nested) keyword arguments"""
+
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+
+    return value
@@ -2,22 +2,17 @@
 
 ################################################
 
-import importlib
-import sys
-
-import matplotlib.pyplot as plt
-import matplotlib.text as mtext
-import matplotlib.axes as maxes
-import matplotlib.figure as mfigure
+import functools
+from contextlib import contextmanager
 
 from .figure import FigurePlus
 from .axes import AxesPlus
-from .text import TextPlus
 
 ################################################
     
 def decorator_figure(func):
     
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         
         if 'FigureClass' not in kwargs:
@@ -30,36 +25,44 @@ def decorator_figure(func):
 ################################################
 #### Constructor wrappers
 
+# What patch() replaced, so unpatch() can restore it
+_patched = {
+    'pyplot': None,
+    'figure': None,
+}
 
 def patch(pyplot=None):
     """
-    Docstring
+    Make pyplot.figure build FigurePlus figures, unless given another
+    FigureClass.
+    
+    matplotlib.text.Text is left alone: FigurePlus figures and AxesPlus
+    axes build their own text (titles, labels, tick labels) as TextPlus,
+    and other figures keep building Text.
+    
+    Patching is idempotent: calling patch() again has no effect until
+    `unpatch` restores the originals. To only patch the figures created in a
+    block of code, use the `patched` context manager.
     """
     
     if pyplot is None:
-        pyplot = plt
+        import matplotlib.pyplot as pyplot
 
     elif hasattr(pyplot,'__name__'):
         if pyplot.__name__ != 'matplotlib.pyplot':
             print("Module passed to 'patch' was not matplotlib.pyplot")
             return
-
-    # patch the classes
-    mtext.Text = TextPlus
     
+    if _patched['pyplot'] is not None:
+        return pyplot
+
     # mfigure.Figure = FigurePlus
     # maxes.Axes = AxesPlus
-
-    # Reload modules (if already loaded) that are
-    # dependent on matplotlib.text.Text
-    modules = ['axes', 'figure']
-    for mod in modules:
-        mod = f'matplotlib.{mod}'
-        if mod in sys.modules.keys():
-            importlib.reload(sys.modules[mod])
             
     # Patch the pyplot module with new constructor methods
+    _patched['figure'] = pyplot.figure
     pyplot.figure = decorator_figure(pyplot.figure)
+    _patched['pyplot'] = pyplot
     
     # methods_to_decorate = ['figure', 'subplots']
     # for method in methods_to_decorate:
@@ -68,3 +71,40 @@ def patch(pyplot=None):
         
     return pyplot
 
+def unpatch():
+    """
+    Restore the pyplot.figure replaced by `patch`. Figures created while
+    patched keep their classes.
+    """
+    
+    pyplot = _patched['pyplot']
+    if pyplot is None:
+        return
+    
+    pyplot.figure = _patched['figure']
+    
+    for key in _patched:
+        _patched[key] = None
+
+def is_patched():
+    return _patched['pyplot'] is not None
+
+@contextmanager
+def patched(pyplot=None):
+    """
+    Context manager patching pyplot (see `patch`) for the figures created
+    inside it only. The originals are restored on exit, unless pyplot was
+    already patched on entry, so blocks can be nested.
+    
+        with patched() as plt:
+            fig = plt.figure()     # a FigurePlus
+        fig = plt.figure()         # a stock Figure
+    """
+    
+    already = is_patched()
+    pyplot = patch(pyplot)
+    try:
+        yield pyplot
+    finally:
+        if not already:
+            unpatch()
@@ -0,0 +1,127 @@
+#! /usr/bin/env python3
+
+# Run with: python -m pytest matplotpatch/tests.py (or python -m unittest matplotpatch.tests)
+
+################################################
+### Load Dependencies
+
+import gc
+import unittest
+
+import numpy as np
+
+import matplotlib
+matplotlib.use('agg')
+
+################################################
+### Tests
+
+class TestTransformCache(unittest.TestCase):
+
+    def test_cache_shrinks_after_clf(self):
+
+        from matplotpatch import FigurePlus
+
+        fig = FigurePlus()
+        for _ in range(20):
+            fig.clf()
+            ax = fig.add_subplot()
+            ax.text(1, 1, 'text', system='pica')
+            ax.plot([0, 1], [0, 1], system=('data', 'pica'))
+
+        size = len(fig._transform_cache)
+        del ax
+        fig.clf()
+        gc.collect()
+
+        self.assertGreater(size, 0)
+        self.assertEqual(len(fig._transform_cache), 0)
+
+class TestAxesPlus(unittest.TestCase):
+
+    def get_texts(self, fig):
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.plot([0, 1e7], [0, 1])
+        fig.canvas.draw()
+
+        texts = {
+            'title': ax.title,
+            'left title': ax._left_title,
+            'right title': ax._right_title,
+            'x label': ax.xaxis.label,
+            'y label': ax.yaxis.label,
+            'offset text': ax.xaxis.offsetText,
+            'x tick label': ax.xaxis.get_major_ticks()[0].label1,
+            'y tick label': ax.yaxis.get_major_ticks()[0].label2,
+        }
+        return ax, texts
+
+    def test_text_is_text_plus(self):
+
+        from matplotpatch import FigurePlus, TextPlus
+
+        _, texts = self.get_texts(FigurePlus())
+        for name, text in texts.items():
+            self.assertIsInstance(text, TextPlus, name)
+
+    def test_text_keeps_axes(self):
+
+        from matplotlib.figure import Figure
+        from matplotpatch import FigurePlus
+
+        ax, texts = self.get_texts(FigurePlus())
+        stock_ax, stock_texts = self.get_texts(Figure())
+
+        self.assertIs(texts['title'].axes, ax)
+        for name, text in texts.items():
+            self.assertEqual(text.axes is ax, stock_texts[name].axes is stock_ax, name)
+
+class TestGuideLayer(unittest.TestCase):
+
+    def build(self):
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotpatch import FigurePlus
+
+        fig = FigurePlus(figsize=(4, 2))
+        FigureCanvasAgg(fig)
+        fig.show_dotgrid(system='pica')
+        fig.line([2, 22], [8, 8], system='pica', c=(0.8, 0.8, 0.8), lw=0.5)
+        fig.text(2, 6, 'Guides', system='pica', size=12)
+        ax = fig.add_subplot(122)
+        ax.plot([0, 1], [0, 1])
+
+        return fig
+
+    def get_pixels(self, fig):
+        return np.array(fig.canvas.buffer_rgba()).astype(int)
+
+    def test_toggle_composites(self):
+
+        fig = self.build()
+        layer = fig.get_guide_layer()
+        fig.canvas.draw()
+
+        # The first toggle draws, and keeps the layers from then on
+        fig.hide_dotgrid()
+        fig.canvas.draw()
+
+        for visible in [True, False]:
+            layer.set_guide_visible(fig._dotgrid, visible)
+            self.assertFalse(fig.stale)
+
+            expected = self.build()
+            if not visible:
+                expected.hide_dotgrid()
+            expected.canvas.draw()
+
+            # Within the rounding of blending the content as a layer
+            diff = np.abs(self.get_pixels(fig) - self.get_pixels(expected))
+            self.assertLessEqual(diff.max(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
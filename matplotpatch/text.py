@@ -5,27 +5,101 @@
 ################################################
 ### Load Dependencies
 
-import re
 import numpy as np
 
 import matplotlib.cbook as cbook
+from matplotlib.artist import Artist, allow_rasterization
 from matplotlib.axes import Axes
 from matplotlib.figure import  Figure
 from matplotlib.text import Text
 from matplotlib.transforms import Bbox, Affine2D
-from matplotlib.offsetbox import AnchoredOffsetbox, TextArea, HPacker
+from matplotlib.patheffects import PathEffectRenderer
 
+from .markup import compile_flag, fill_markup
+from .metrics import metric_cache, style_cache, scale_layout, get_font_key, get_renderer_key, get_headless_renderer
 from .transforms import transform_factory
+from .wrap import wrap_lines, measure_words
 
 class TextPlus(Text):
     
-    def __init__(self, *args, linewidth=None, **kwargs):
+    # Layouts in units of points, shared by every dpi (see `_get_layout`)
+    _layout_cache = cbook.maxdict(1024)
+    
+    def __init__(self, *args, linewidth=None, exact_layout=False, wrapmode='greedy', hyphenate=None, **kwargs):
         super().__init__(*args, **kwargs)
         
         self._linewidth = linewidth
         if linewidth:
             self._wrap = True
             
+        self._exact_layout = exact_layout
+        
+        self._wrapmode = wrapmode
+        self._hyphenate = hyphenate
+        self._justified = (None, ())
+        
+    def set_wrapmode(self, mode, hyphenate=None):
+        """
+        Set how wrapped text is broken into lines.
+        
+        Parameters
+        ----------
+        mode : {'greedy', 'optimal'}
+            Fill each line in turn, or choose the breaks that minimise the
+            raggedness of the whole paragraph.
+        hyphenate : bool or callable, optional
+            In 'optimal' mode, allow breaks inside words: True breaks at soft
+            hyphens (U+00AD), a callable returns the fragments of a word.
+        """
+        cbook._check_in_list(['greedy', 'optimal'], mode=mode)
+        self._wrapmode = mode
+        self._hyphenate = hyphenate
+        self.stale = True
+            
+    def set_exact_layout(self, exact):
+        """
+        Set whether the layout is measured again at every dpi.
+        
+        By default a layout computed at one dpi is rescaled for the others,
+        which ignores the (small) effect of font hinting on text extents.
+        """
+        self._exact_layout = exact
+        self.stale = True
+        
+    def _get_layout_key(self, renderer):
+        """
+        Return a hashable tuple of the properties the layout depends on,
+        excluding the dpi. The font is keyed on the file it resolves to, and
+        the renderer on its type, since hinting differs between Agg and the
+        vector backends.
+        """
+        kind = get_renderer_key(renderer)
+        return (self.get_text(), self._verticalalignment, self._horizontalalignment,
+                self._multialignment, hash(self._fontproperties), get_font_key(self._fontproperties),
+                kind, self._rotation, self._rotation_mode, self._linespacing, self.get_usetex(),
+                self._get_justified_lines())
+    
+    def get_prop_tup(self, renderer=None):
+        """
+        Return a hashable tuple of properties.
+        """
+        # AG edit - multialignment and justification also change the layout
+        return super().get_prop_tup(renderer=renderer) + (
+            self._multialignment, self._get_justified_lines())
+    
+    def set_multialignment(self, align):
+        """
+        Set the text alignment for multiline texts.
+
+        Parameters
+        ----------
+        align : {'left', 'right', 'center', 'justify'}
+        """
+        cbook._check_in_list(['center', 'right', 'left', 'justify'],
+                             align=align)
+        self._multialignment = align
+        self.stale = True
+            
     def set_verticalalignment(self, align):
         """
         Set the vertical alignment
@@ -40,6 +114,19 @@ class TextPlus(Text):
         self._verticalalignment = align
         self.stale = True
     
+    def get_window_extent(self, renderer=None, dpi=None):
+        """
+        Return the `.Bbox` bounding the text, in display units.
+        
+        If the figure has not been drawn yet and no renderer is given, the
+        text is measured from the font files, without a canvas.
+        """
+        # AG edit
+        if (renderer is None) and (self._renderer is None) and (self.figure._cachedRenderer is None):
+            renderer = get_headless_renderer(self.figure.dpi if dpi is None else dpi)
+            
+        return super().get_window_extent(renderer=renderer, dpi=dpi)
+    
     def _get_wrap_line_width(self):
         """
         Return the maximum line width for wrapping text based on the current
@@ -72,6 +159,60 @@ class TextPlus(Text):
 
         return line_width
     
+    def _get_wrapped_text(self):
+        """
+        Return a copy of the text with new lines added, so that the text is
+        wrapped to `_get_wrap_line_width`.
+        """
+        # AG edit - measure each word once, rather than every growing
+        # prefix of the line as matplotlib does
+        if self.get_usetex():
+            return self.get_text()
+        
+        line_width = self._get_wrap_line_width()
+        lines = wrap_lines(self.get_text(), line_width, self._renderer, self._fontproperties,
+                           mode=self._wrapmode, hyphenate=self._hyphenate)
+        
+        text = '\n'.join(line for line, _ in lines)
+        soft = tuple(i for i, (_, is_soft) in enumerate(lines) if is_soft)
+        self._justified = (text, soft)
+        
+        return text
+    
+    def _get_justified_lines(self):
+        """
+        Return the indices of the lines to justify: those of the wrapped text
+        that end at an inserted break.
+        """
+        text, soft = self._justified
+        if (self._multialignment != 'justify') or (text != self.get_text()):
+            return ()
+        
+        return soft
+    
+    def _justify_layout(self, lines, ws, hs, offset_layout, renderer):
+        """
+        Split the justified lines into words, spread over the wrap width.
+        """
+        justified = self._get_justified_lines()
+        line_width = self._get_wrap_line_width()
+        
+        entries = []
+        for i, (line, w, h, (x, y)) in enumerate(zip(lines, ws, hs, offset_layout)):
+            words = line.split(' ')
+            if (i not in justified) or (len(words) < 2):
+                entries.append((line, w, h, (x, y)))
+                continue
+            
+            widths, _ = measure_words(words, renderer, self._fontproperties)
+            gap = (line_width - sum(widths)) / (len(words) - 1)
+            for word, width in zip(words, widths):
+                entries.append((word, width, h, (x, y)))
+                x += width + gap
+                
+        lines, ws, hs, offset_layout = map(list, zip(*entries))
+        return lines, ws, hs, offset_layout, line_width
+    
     def _get_layout(self, renderer):
         """
         return the extent (bbox) of the text together with
@@ -81,6 +222,16 @@ class TextPlus(Text):
         key = self.get_prop_tup(renderer=renderer)
         if key in self._cached:
             return self._cached[key]
+        
+        # AG edit - the layout is linear in dpi, so one computed at another
+        # dpi is rescaled rather than measured again
+        pixels_per_pt = 1/72*self.figure._dpi
+        if not self._exact_layout:
+            layout_key = self._get_layout_key(renderer)
+            if layout_key in self._layout_cache:
+                ret = scale_layout(self._layout_cache[layout_key], pixels_per_pt)
+                self._cached[key] = ret
+                return ret
 
         thisx, thisy = 0.0, 0.0
         lines = self.get_text().split("\n")  # Ensures lines is not empty.
@@ -91,20 +242,19 @@ class TextPlus(Text):
         ys = []
 
         # Full vertical extent of font, including ascenders and descenders:
-        _, lp_h, lp_d = renderer.get_text_width_height_descent(
-            "lp", self._fontproperties,
+        _, lp_h, lp_d = metric_cache.get_text_width_height_descent(
+            renderer, "lp", self._fontproperties,
             ismath="TeX" if self.get_usetex() else False)
         min_dy = (lp_h - lp_d) * self._linespacing
         
         # AG edit
-        pixels_per_pt = 1/72*self.figure._dpi
         line_height = (pixels_per_pt * self.get_fontsize()) * self._linespacing
 
         for i, line in enumerate(lines):
             clean_line, ismath = self._preprocess_math(line)
             if clean_line:
-                w, h, d = renderer.get_text_width_height_descent(
-                    clean_line, self._fontproperties, ismath=ismath)
+                w, h, d = metric_cache.get_text_width_height_descent(
+                    renderer, clean_line, self._fontproperties, ismath=ismath)
             else:
                 w = h = d = 0
 
@@ -152,7 +302,7 @@ class TextPlus(Text):
 
         # now offset the individual text lines within the box
         malign = self._get_multialignment()
-        if malign == 'left':
+        if malign in ['left', 'justify']:
             offset_layout = [(x, y) for x, y in zip(xs, ys)]
         elif malign == 'center':
             offset_layout = [(x + width / 2 - w / 2, y)
@@ -160,6 +310,12 @@ class TextPlus(Text):
         elif malign == 'right':
             offset_layout = [(x + width - w, y)
                              for x, y, w in zip(xs, ys, ws)]
+        
+        # AG edit - justified lines are drawn word by word
+        if self._get_justified_lines():
+            lines, ws, hs, offset_layout, line_width = self._justify_layout(
+                lines, ws, hs, offset_layout, renderer)
+            width = xmax = max(width, line_width)
 
         # the corners of the unrotated bounding box
         corners_horiz = np.array(
@@ -237,13 +393,302 @@ class TextPlus(Text):
 
         ret = bbox, list(zip(lines, zip(ws, hs), *xys.T)), descent
         self._cached[key] = ret
+        if not self._exact_layout:
+            self._layout_cache[layout_key] = scale_layout(ret, 1/pixels_per_pt)
         return ret
 
 ##########################################
 
+class RichText(Artist):
+    """
+    Artist drawing lines of differently styled text runs in a single pass.
+    
+    Runs are placed one after the other along each line, and lines are
+    stacked upwards from the last one, whose baseline sits on (x, y), at a
+    fixed increment of linespacing times the base font size. The layout is
+    measured once and reused until the text, the fonts or the dpi change.
+    
+    Parameters
+    ----------
+    x, y : float
+        Position of the start of the baseline of the last line.
+    lines : tuple
+        Lines of (text, highlight) runs, as returned by `fill_markup`.
+    styles : dict
+        Text instances giving the font and colour of each highlight, with
+        the base style under None. They are only used as style templates.
+    linespacing : float
+        Line increment, as a multiple of the base font size.
+    """
+    
+    zorder = 3
+    
+    def __init__(self, x, y, lines, styles, linespacing=1.2, transform=None):
+        super().__init__()
+        
+        self._x = x
+        self._y = y
+        self._lines = lines
+        self._styles = styles
+        self._linespacing = linespacing
+        
+        if transform is not None:
+            self.set_transform(transform)
+        
+        # Like text, labels are not clipped to the axes they are added to
+        self.set_clip_on(False)
+        
+        self._renderer = None
+        self._layout = None
+        self._layout_key = None
+        
+    def set_position(self, xy):
+        self._x, self._y = xy
+        self.stale = True
+        
+    def get_position(self):
+        return self._x, self._y
+        
+    def set_lines(self, lines):
+        """Set the lines of (text, highlight) runs to draw"""
+        self._lines = lines
+        self.stale = True
+        
+    def get_lines(self):
+        return self._lines
+        
+    def _get_y_increment(self, renderer):
+        """Return the distance between consecutive baselines, in px"""
+        
+        fs = self._styles[None].get_fontsize()
+        return renderer.points_to_pixels(fs * self._linespacing)
+        
+    def _measure(self, renderer, s, style, ismath):
+        
+        prop = style._fontproperties
+        w, h, d = metric_cache.get_text_width_height_descent(renderer, s, prop, ismath=ismath)
+        
+        # Renderers report the inked extent, which drops the spaces at either
+        # end of a run, so measure those runs between two bars
+        if (ismath is False) and (s != s.strip()):
+            bars, _, _ = metric_cache.get_text_width_height_descent(renderer, '||', prop, ismath=False)
+            w, _, _ = metric_cache.get_text_width_height_descent(renderer, f'|{s}|', prop, ismath=False)
+            w -= bars
+            
+        return w, h, d
+        
+    def _get_layout_key(self, renderer):
+        
+        dpi = renderer.points_to_pixels(72)
+        kind = get_renderer_key(renderer)
+        fonts = tuple((fmt, hash(style._fontproperties), get_font_key(style._fontproperties))
+                      for fmt, style in self._styles.items())
+        
+        return fonts, self._linespacing, dpi, kind
+        
+    def _layout_lines(self, lines, renderer):
+        """
+        Return the runs of lines, grouped by highlight as lists of
+        (text, ismath, x, y) relative to the position, and their bbox.
+        """
+        
+        increment = self._get_y_increment(renderer)
+        
+        runs = {}
+        extents = []
+        n = len(lines)
+        for i, line in enumerate(lines):
+            x = 0
+            y = (n - 1 - i) * increment
+            for s, fmt in line:
+                if not s:
+                    continue
+                
+                style = self._styles[fmt]
+                clean, ismath = style._preprocess_math(s)
+                w, h, d = self._measure(renderer, clean, style, ismath)
+                
+                runs.setdefault(fmt, []).append((clean, ismath, x, y))
+                extents.append([x, y - d, x + w, y - d + h])
+                x += w
+        
+        if extents:
+            extents = np.asarray(extents)
+            bbox = Bbox([extents[:, :2].min(axis=0), extents[:, 2:].max(axis=0)])
+        else:
+            bbox = Bbox.null()
+        
+        return runs, bbox
+        
+    def _get_layout(self, renderer):
+        
+        key = (self._lines,) + self._get_layout_key(renderer)
+        if key == self._layout_key:
+            return self._layout
+        
+        self._layout = self._layout_lines(self._lines, renderer)
+        self._layout_key = key
+        return self._layout
+        
+    def _get_renderer(self, renderer):
+        
+        if renderer is not None:
+            self._renderer = renderer
+        if self._renderer is None:
+            self._renderer = get_headless_renderer(self.figure._dpi)
+            
+        return self._renderer
+        
+    def get_window_extent(self, renderer=None):
+        
+        _, bbox = self._get_layout(self._get_renderer(renderer))
+        posx, posy = self.get_transform().transform((self._x, self._y))
+        
+        return bbox.translated(posx, posy)
+        
+    def _draw_runs(self, renderer, placed):
+        """
+        Draw (runs, posx, posy) layouts, with one graphics context for each
+        highlight whatever the number of layouts.
+        """
+        
+        canvasw, canvash = renderer.get_canvas_width_height()
+        
+        for fmt, style in self._styles.items():
+            prop = style._fontproperties
+            alpha = style.get_alpha()
+            
+            gc = renderer.new_gc()
+            gc.set_foreground(style.get_color())
+            gc.set_alpha(self.get_alpha() if alpha is None else alpha)
+            gc.set_url(self._url)
+            self._set_gc_clip(gc)
+            
+            if style.get_path_effects():
+                textrenderer = PathEffectRenderer(style.get_path_effects(), renderer)
+            else:
+                textrenderer = renderer
+            
+            for runs, posx, posy in placed:
+                for s, ismath, x, y in runs.get(fmt, ()):
+                    x = x + posx
+                    y = y + posy
+                    if renderer.flipy():
+                        y = canvash - y
+                        
+                    if ismath == 'TeX':
+                        textrenderer.draw_tex(gc, x, y, s, prop, 0)
+                    else:
+                        textrenderer.draw_text(gc, x, y, s, prop, 0, ismath=ismath)
+                    
+            gc.restore()
+        
+    @allow_rasterization
+    def draw(self, renderer):
+        
+        if renderer is not None:
+            self._renderer = renderer
+        if not self.get_visible():
+            return
+        
+        renderer.open_group('richtext', self.get_gid())
+        
+        runs, _ = self._get_layout(renderer)
+        posx, posy = self.get_transform().transform((self._x, self._y))
+        self._draw_runs(renderer, [(runs, posx, posy)])
+            
+        renderer.close_group('richtext')
+        self.stale = False
+
+class RichTextCollection(RichText):
+    """
+    Artist drawing many `RichText` labels that share their styles.
+    
+    Each distinct label is laid out once, whatever the number of times it
+    appears, all positions go through the transform in a single call, and
+    every label is drawn in the same pass.
+    
+    Parameters
+    ----------
+    offsets : (N, 2) array
+        Position of each label, as for `RichText`.
+    lines : list
+        Lines of (text, highlight) runs of each label.
+    styles : dict
+        Styles shared by all labels, as for `RichText`.
+    """
+    
+    def __init__(self, offsets, lines, styles, linespacing=1.2, transform=None):
+        super().__init__(None, None, lines, styles, linespacing=linespacing, transform=transform)
+        
+        self._offsets = np.asarray(offsets, dtype=float).reshape(-1, 2)
+        if len(self._offsets) != len(lines):
+            raise Exception('There must be one position for each label')
+        
+        self._layouts = {}
+        
+    def set_offsets(self, offsets):
+        self._offsets = np.asarray(offsets, dtype=float).reshape(-1, 2)
+        self.stale = True
+        
+    def get_offsets(self):
+        return self._offsets
+        
+    def set_position(self, xy):
+        raise Exception('Use set_offsets to move the labels of a collection')
+        
+    def _get_layout(self, renderer):
+        """Return the layout of each label, in order"""
+        
+        key = self._get_layout_key(renderer)
+        if key != self._layout_key:
+            self._layouts = {}
+            self._layout_key = key
+        
+        layouts = self._layouts
+        for lines in self._lines:
+            if lines not in layouts:
+                layouts[lines] = self._layout_lines(lines, renderer)
+        
+        return [layouts[lines] for lines in self._lines]
+        
+    def get_window_extent(self, renderer=None):
+        
+        layouts = self._get_layout(self._get_renderer(renderer))
+        if not layouts:
+            return Bbox.null()
+        
+        extents = np.array([bbox.extents for _, bbox in layouts])
+        offsets = self.get_transform().transform(self._offsets)
+        extents += np.tile(offsets, 2)
+        
+        return Bbox([np.nanmin(extents[:, :2], axis=0), np.nanmax(extents[:, 2:], axis=0)])
+        
+    @allow_rasterization
+    def draw(self, renderer):
+        
+        if renderer is not None:
+            self._renderer = renderer
+        if not self.get_visible():
+            return
+        
+        renderer.open_group('richtextcollection', self.get_gid())
+        
+        layouts = self._get_layout(renderer)
+        offsets = self.get_transform().transform(self._offsets)
+        
+        placed = [(runs, posx, posy) for (runs, _), (posx, posy) in zip(layouts, offsets)
+                  if np.isfinite(posx) and np.isfinite(posy)]
+        self._draw_runs(renderer, placed)
+        
+        renderer.close_group('richtextcollection')
+        self.stale = False
+
+##########################################
+
 class TextMuliColor(object):
     
-    def __init__(self, x=None, y=None, string=None, flag='[:]', highlight={}, linespacing=1.2, parent=None, system='axes', anchor='bl', **kwargs):
+    def __init__(self, x=None, y=None, string=None, flag='[:]', highlight={}, values=None, linespacing=1.2, parent=None, system='axes', anchor='bl', **kwargs):
         
         self.parent = parent
         if isinstance(parent, Axes):
@@ -254,8 +699,9 @@ class TextMuliColor(object):
             raise Exception('Object passed must be a Figure or Axes instance')
         
         self.string = string
-        assert isinstance(flag,str) & (len(flag) == 3)
+        compile_flag(flag)
         self.flag = flag
+        self.values = values
         
         self.x = x
         self.y = y
@@ -268,9 +714,9 @@ class TextMuliColor(object):
         self.anchor = anchor
         self.transform = self._generate_transform()
 
-        self.renderer = self.figure.canvas.get_renderer()
-        self.boxes = None
-        self.children = None
+        self.lines = None
+        self.styles = None
+        self.artist = None
         
         self._generate_lines()
 
@@ -280,111 +726,100 @@ class TextMuliColor(object):
 
         return self.transform
     
-    def _get_default_fontproperties(self):
-        """Docstring"""
-        
-        default_text = TextPlus(0,0,'', **self.base)
-        fp = default_text._fontproperties
-        del(default_text)
-        
-        return fp
-
     def _generate_lines(self):
         """
-        Docstring
+        Fill in the markup and resolve the style of each highlight it uses.
         """
-        opn,sep,clo = self.flag
-
-        expr = f"([\{opn}].*?[\{clo}])"
-        parts = re.split(expr, self.string)
-
-        expr = f"[\{opn}](.*?)[\{sep}](.*?)[\{clo}]"
-        lines = [[]]
-        n = 0
-        for part in parts:
-            opts = self.base.copy()
-            
-            p = re.match(expr,part)
-            if p:
-                part,fmt = p.groups()
-                fmt = int(fmt)
-                opts.update(self.highlight[fmt])
-                
-            rows = part.split('\n')
-            for i,row in enumerate(rows):
-                if i != 0:
-                    lines.append([])
-                    n += 1
-                
-                txt = TextArea(row, textprops=opts)
-                lines[n].append(txt)
-                
-        boxes  = []
-        for line in lines:
-            box = HPacker(children=line, align="baseline", pad=0, sep=0)
-            boxes.append(box)
+        # The run structure of the markup is parsed once per template
+        lines = fill_markup(self.string, self.flag, self.values)
+        
+        self.lines = lines
+        self.styles = self._get_styles([lines])
+        return lines
+    
+    def _get_styles(self, labels):
+        """Return the style of each highlight used by the labels"""
+        
+        fmts = {fmt for lines in labels for line in lines for _, fmt in line}
+        fmts.discard(None)
+        
+        styles = {None: style_cache.get_style(self.base)}
+        for fmt in fmts:
+            opts = dict(self.base)
+            opts.update(self.highlight[fmt])
+            styles[fmt] = style_cache.get_style(opts)
             
-        self.boxes = boxes
-        return boxes
+        return styles
     
-    def _get_xy_px(self,x,y):
+    def draw(self, x=None, y=None):
+        """
+        Add the text to the parent, as a single `RichText` artist.
+        """
         
-        # Get default font properties and text descent, in px
-        fp = self._get_default_fontproperties()
-        _,_,descent = self.renderer.get_text_width_height_descent("lp", fp, ismath=False)
+        if x is None:
+            x = self.x
+        if y is None:
+            y = self.y
+        if (x is None) and (y is None):
+            raise Exception('No x,y arguments passed!')
+        
+        self.artist = RichText(x, y, self.lines, self.styles,
+                               linespacing=self.linespacing, transform=self.transform)
+        self.parent.add_artist(self.artist)
+        
+        return self.artist
 
-        # Determine the x,y position in display coordinates
-        xy_px = self.transform.transform([x, y]) - [0, descent]
+##########################################
+
+class TextMuliColorBatch(TextMuliColor):
+    """
+    Many multicolour labels sharing one highlight map and one transform,
+    drawn as a single `RichTextCollection`.
     
-        return xy_px
+    x, y are arrays of positions and strings a list of markup strings (or a
+    single string used for every label). values is None, a mapping shared
+    by all labels, or a list with one mapping per label.
+    """
     
-    def _get_y_increment(self):
+    def __init__(self, x=None, y=None, strings=None, flag='[:]', highlight={}, values=None, linespacing=1.2, parent=None, system='axes', anchor='bl', **kwargs):
         
-        fp = self._get_default_fontproperties()
-
-        # determine line increment, in px
-        dpi = self.figure._dpi
-        fs = fp.get_size()
-        return (fs*self.linespacing) * (dpi/72)
-    
-    def _get_line_max_extent(self):
-
-        fp = self._get_default_fontproperties()
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel())
         
-        width = height = descent = 0
-        for line in self.string.split('\n'):
-            w,h,d = self.renderer.get_text_width_height_descent(line, fp, ismath=False)
-            
-            width = max(width,w)
-            height = max(height,h)
-            descent = max(descent,d)
+        if isinstance(strings, str):
+            strings = [strings] * len(x)
+        if len(strings) != len(x):
+            raise Exception('There must be one string for each x,y position')
         
-        return width,height,descent
+        super().__init__(x, y, list(strings), flag=flag, highlight=highlight, values=values,
+                         linespacing=linespacing, parent=parent, system=system, anchor=anchor, **kwargs)
+        
+    def _generate_lines(self):
+        """
+        Fill in the markup of every label, and resolve the shared styles.
+        """
+        
+        values = self.values
+        if (values is None) or hasattr(values, 'keys'):
+            values = [values] * len(self.string)
+        
+        labels = [fill_markup(string, self.flag, vals) for string, vals in zip(self.string, values)]
+        
+        self.lines = labels
+        self.styles = self._get_styles(set(labels))
+        return labels
     
     def draw(self, x=None, y=None):
         """
-        Docstring
+        Add the labels to the parent, as a single `RichTextCollection`.
         """
-        # https://stackoverflow.com/questions/33159134/matplotlib-y-axis-label-with-multiple-colors
         
         if x is None:
             x = self.x
         if y is None:
             y = self.y
-        if (x is None) and (y is None):
-            raise Exception('No x,y arguments passed!')
         
-        xy_px = self._get_xy_px(x,y)
-        y_incr_px = self._get_y_increment()
-        boxes = self.boxes
-
-        for box in boxes[::-1]:
-            x,y = self.transform.inverted().transform(xy_px)
-            anchored_xbox = AnchoredOffsetbox(loc=3, child=box, pad=0, frameon=False,
-                                        bbox_to_anchor=(x,y), bbox_transform=self.transform, borderpad=0)
-            self.parent.add_artist(anchored_xbox)
-            xy_px[1] += y_incr_px
-            
-        self.children = [textarea.get_children() for box in boxes for textarea in box.get_children()]
+        self.artist = RichTextCollection(np.column_stack([x, y]), self.lines, self.styles,
+                                         linespacing=self.linespacing, transform=self.transform)
+        self.parent.add_artist(self.artist)
         
-        return self.children
\ No newline at end of file
+        return self.artist
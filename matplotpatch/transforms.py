@@ -2,22 +2,52 @@
 
 ################################################
 ### Load Dependencies
-import re
+import sys
+import weakref
+from collections import namedtuple
 
-import matplotlib.pyplot as plt
-from matplotlib.transforms import Bbox, BboxTransformFrom, blended_transform_factory, CompositeGenericTransform
+import numpy as np
+
+from matplotlib.transforms import Bbox, Affine2DBase, blended_transform_factory
+
+from .units import unit_registry
+
+# Figures and axes are recognised without importing matplotlib.figure or
+# matplotlib.axes (and everything they import): if the module is not
+# loaded yet, object cannot be one of its instances.
+
+def _is_figure(object):
+    module = sys.modules.get('matplotlib.figure')
+    return (module is not None) and isinstance(object, module.Figure)
+
+def _is_axes(object):
+    module = sys.modules.get('matplotlib.axes')
+    return (module is not None) and isinstance(object, module.Axes)
 
 ################################################
 ### Classes
 
-class PointTransform(CompositeGenericTransform):
+class PointTransform(Affine2DBase):
     """
     Create a new imperial-unit coordinate system around a given anchor.
+    
+    The transform is a node in matplotlib's transform tree, with the figure
+    bbox (size and dpi) and the axes position as its children. Its matrix is
+    only recomputed when one of those changes, or when the size of a
+    callable unit (see `UnitRegistry.register`) does.
     """
+    
+    _anchors = {
+        'bl' : lambda x: x[0],
+        'tl' : lambda x: x.diagonal(),
+        'tr' : lambda x: x[1],
+        'br' : lambda x: x.flatten()[[2,1]],
+    }
 
     def __init__(self, object=None, anchor:str='bl', system:str='12pt'):
+        super().__init__()
         
-        if isinstance(object, plt.Figure):
+        if _is_figure(object):
             fig = object
         elif hasattr(object,'figure'):
             fig = object.figure
@@ -29,62 +59,152 @@ class PointTransform(CompositeGenericTransform):
         self.system = str(system)
         self.anchor = anchor
         
-        self.fig_pos = fig.bbox._points
-        self.obj_pos = self.get_object_position()
+        # Fail early on unknown units
+        unit_registry.parse(self.system)
+        self._dynamic = unit_registry.is_dynamic(self.system)
+        self._scale = None
+        
+        if _is_axes(object):
+            self.set_children(fig.bbox, object._position)
+        else:
+            self.set_children(fig.bbox)
         
-        bbox = self.get_bbox()       
-        super().__init__(BboxTransformFrom(bbox), self.fig.transFigure)
+        self._mtx = None
+        self._inverted = None
+    
+    @property
+    def fig_pos(self):
+        return self.fig.bbox.get_points()
+    
+    @property
+    def obj_pos(self):
+        return self.get_object_position()
 
     def get_object_position(self):
-        """docstring"""
+        """Return the corners of the anchoring object, in display coordinates"""
         
         obj_pos = self.fig_pos
             
-        if isinstance(self.obj, plt.Axes):
-            axis_position = self.obj.get_position()
+        if _is_axes(self.obj):
+            axis_position = self.obj._position.get_points()
             obj_pos = self.fig.transFigure.transform(axis_position)
         
         return obj_pos
     
     def get_bbox(self):
+        """Return the figure extent, in units of this coordinate system"""
         
-        anchors = {
-            'bl' : lambda x: x[0],
-            'tl' : lambda x: x.diagonal(),
-            'tr' : lambda x: x[1],
-            'br' : lambda x: x.flatten()[[2,1]],
-        }
-
-        # scale = self.fig._dpi / (72 / self.system)
-        scale = self.get_scale()
-        points = (self.fig_pos - anchors[self.anchor](self.obj_pos)) / scale
+        points = (self.fig_pos - self._anchors[self.anchor](self.obj_pos)) / self.get_scale()
         bbox =  Bbox(points)
         return bbox
     
+    def _check_scale(self):
+        """
+        Invalidate the transform if its unit is a callable (e.g. em) whose
+        size changed since the matrix was computed. Such units depend on
+        state outside the transform tree, like rcParams.
+        """
+        
+        if self._dynamic and not self._invalid and (self.get_scale() != self._scale):
+            self.invalidate()
+    
+    def inverted(self):
+        self._check_scale()
+        return super().inverted()
+    
+    def get_matrix(self):
+        self._check_scale()
+        if self._invalid:
+            scale = self._scale = self.get_scale()
+            x0, y0 = self._anchors[self.anchor](self.get_object_position())
+            self._mtx = np.array([[scale, 0.0  , x0 ],
+                                  [0.0  , scale, y0 ],
+                                  [0.0  , 0.0  , 1.0]],
+                                 float)
+            self._inverted = None
+            self._invalid = 0
+        return self._mtx
+    
     def get_scale(self):
+        """Return the number of pixels per unit"""
         
-        string = self.system
-        dpi = self.fig._dpi
+        return unit_registry.get_scale(self.system, self.fig._dpi)
+
+def blend_transforms(x_transform, y_transform):
+    """
+    Blend two transforms. The same transform on both axes is returned as-is,
+    and two affine transforms blend into a single `BlendedAffine2D`.
+    """
+    
+    if x_transform is y_transform:
+        return x_transform
+    
+    return blended_transform_factory(x_transform, y_transform)
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'size'])
+
+class TransformCache(object):
+    """
+    Per-figure memo of the transforms built by `transform_factory`.
+    
+    Entries are keyed on (object, system, anchor). The transforms follow
+    figure resizes, dpi changes and `set_position` by themselves, so
+    entries never go stale. Both the object and the transforms are held
+    weakly: an entry lives as long as an artist is using its transform,
+    and no longer than its axes, e.g. after `clf`.
+    """
+    
+    def __init__(self):
+        self._entries = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
         
-        res = re.match("([0-9.]+)(\w+)", string)
-        if res is not None:
-            spacing,unit,*_ = res.groups()
-            spacing = float(spacing)
-            
-            if unit in ['pt', 'point', 'points']:
-                val = dpi * spacing / 72
-            elif unit in ['pc','pica','picas']:
-                val = dpi * spacing / 6
-            elif unit in ['in', 'inch', 'inches']:
-                val = dpi * spacing
-            elif unit in ['mm']:
-                val = dpi * spacing / 25.4
-            elif unit in ['cm']:
-                val = dpi * spacing / 2.54
-            else:
-                raise Exception(f"'{string}' is not a valid argument for spacing")
-            
-        return val
+    def __len__(self):
+        return sum(len(entries) for entries in list(self._entries.values()))
+    
+    def get(self, key):
+        """Return the cached transform for key, or None if missing"""
+        
+        entries = self._entries.get(key[0])
+        ref = entries.get(key[1:]) if entries is not None else None
+        transform = ref() if ref is not None else None
+        if transform is not None:
+            self.hits += 1
+            return transform
+        
+        self.misses += 1
+        return None
+    
+    def set(self, key, transform):
+        
+        owner, rest = key[0], key[1:]
+        entries = self._entries.get(owner)
+        if entries is None:
+            entries = self._entries[owner] = {}
+        
+        def discard(ref, entries=entries):
+            if entries.get(rest) is ref:
+                del entries[rest]
+                
+        entries[rest] = weakref.ref(transform, discard)
+        
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, len(self))
+
+def get_transform_cache(fig):
+    """Return the transform cache attached to fig, creating it if needed"""
+    
+    cache = getattr(fig, '_transform_cache', None)
+    if cache is None:
+        cache = TransformCache()
+        fig._transform_cache = cache
+        
+    return cache
 
 def transform_factory(object=None, system='figure', anchor='bl'):
     
@@ -93,9 +213,10 @@ def transform_factory(object=None, system='figure', anchor='bl'):
     
     # Deal with arguments        
     if object is None:
+        import matplotlib.pyplot as plt
         fig = plt.gcf()
         ob = fig
-    elif isinstance(object, plt.Figure):
+    elif _is_figure(object):
         fig = object
         ob = fig
     elif hasattr(object, 'figure'):
@@ -108,34 +229,102 @@ def transform_factory(object=None, system='figure', anchor='bl'):
         system = [system]
     n = min(2, len(system))
     
-    transforms = []
-    for i in range(n):
-        syst = system[i]
+    # Reuse the transform if this figure already built it
+    cache = get_transform_cache(fig)
+    key = (ob, tuple(system[:n]), anchor)
+    transform = cache.get(key)
+    if transform is not None:
+        return transform
+    
+    if n == 2:
+        # Blends share the single-system transforms held in the cache
+        transforms = [transform_factory(ob, syst, anchor) for syst in system[:n]]
+        transform = blend_transforms(*transforms)
+    else:
+        syst = system[0]
         
         if syst == 'figure':
-            trans = fig.transFigure
+            transform = fig.transFigure
         elif syst in ['ax','axes','axis']:
-            trans = ob.transAxes
+            transform = ob.transAxes
         elif syst == 'data':
-            trans = ob.transData
+            transform = ob.transData
         elif syst in ['pc','pica','picas']:
-            trans = PointTransform(object=ob, anchor=anchor, system='12pt')
+            transform = PointTransform(object=ob, anchor=anchor, system='12pt')
         elif syst in ['in', 'inch', 'inches']:
-            trans = PointTransform(object=ob, anchor=anchor, system='1in')
+            transform = PointTransform(object=ob, anchor=anchor, system='1in')
         elif syst in ['pt', 'point', 'points']:
-            trans = PointTransform(object=ob, anchor=anchor, system='1pt')
+            transform = PointTransform(object=ob, anchor=anchor, system='1pt')
         else:
-            trans = PointTransform(object=ob, anchor=anchor, system=syst)
+            transform = PointTransform(object=ob, anchor=anchor, system=syst)
+    
+    cache.set(key, transform)
         
-        transforms.append(trans)
+    return transform
+    
+def _conversion_transforms(src, dst, object, anchor):
+    
+    if isinstance(anchor, str):
+        anchor = (anchor, anchor)
+    
+    trans_src = transform_factory(object, system=src, anchor=anchor[0])
+    trans_dst = transform_factory(object, system=dst, anchor=anchor[1])
+    
+    return trans_src, trans_dst
+
+def conversion_matrix(src='pica', dst='figure', object=None, anchor='bl'):
+    """
+    Return the 3x3 affine matrix taking coordinates in `src` to `dst`.
+    
+    `src` and `dst` accept anything `transform_factory` does, including
+    (horizontal, vertical) tuples of systems. `anchor` is either shared by
+    both systems or given as a (src, dst) pair. Returns None if either
+    system is not affine (e.g. data on a log scale).
+    """
+    
+    trans_src, trans_dst = _conversion_transforms(src, dst, object, anchor)
+    if not (trans_src.is_affine and trans_dst.is_affine):
+        return None
+    
+    mtx_src = trans_src.get_affine().get_matrix()
+    mtx_dst = trans_dst.get_affine().get_matrix()
+    
+    return np.linalg.solve(mtx_dst, mtx_src)
 
-    if len(transforms) == 2:
-        transform = blended_transform_factory(*transforms)
-    elif len(transforms) == 1:
-        transform = transforms[0]
+def convert(points, src='pica', dst='figure', object=None, anchor='bl'):
+    """
+    Convert an array of coordinates from one coordinate system to another.
+    
+    Parameters
+    ----------
+    points : array-like, shape (2,) or (N, 2)
+        Coordinates in the `src` system.
+    src, dst : str or (str, str)
+        Source and destination systems, as accepted by `transform_factory`
+        (e.g. 'pica', 'pt', 'in', 'mm', 'cm', 'axes', 'data', 'figure' or a
+        per-axis tuple such as ('data', 'pica')).
+    object : Figure or Axes, optional
+        The object the systems refer to. Defaults to the current figure.
+    anchor : str or (str, str), optional
+        Anchor of the typographic systems, shared or as a (src, dst) pair.
         
-    return transform
+    Returns
+    -------
+    ndarray of the same shape as `points`, in the `dst` system.
+    """
     
+    points = np.asarray(points, dtype=float)
+    xy = points.reshape(-1, 2)
+    
+    mtx = conversion_matrix(src=src, dst=dst, object=object, anchor=anchor)
+    if mtx is not None:
+        out = xy @ mtx[:2,:2].T + mtx[:2,2]
+    else:
+        trans_src, trans_dst = _conversion_transforms(src, dst, object, anchor)
+        out = trans_dst.inverted().transform(trans_src.transform(xy))
+    
+    return out.reshape(points.shape)
+
 def decorator_custom_transform(func):
                 
     def wrapper(self, *args, system=None, anchor='bl', **kwargs):
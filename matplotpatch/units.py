@@ -0,0 +1,109 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+################################################
+### Classes
+
+class UnitRegistry(object):
+    """
+    Lookup of typographic units, stored as a number of points per unit.
+
+    System strings such as '12pt', '0.5in', '-1.5pc' or 'mm' are parsed once
+    and cached. Custom units can be registered with a fixed size, or with a
+    callable returning the size in points when it depends on other state::
+
+        unit_registry.register('col', 13 * 12)
+        unit_registry.register('em', lambda: rcParams['font.size'])
+
+    A callable unit is called again every time a `PointTransform` in that
+    unit is used, so it follows e.g. changes to rcParams. Blends built on
+    such a transform keep their matrix until it is next used directly or
+    invalidated (a resize, a dpi change, or `invalidate()`).
+    """
+
+    _pattern = re.compile(r"^\s*([-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+))?\s*([^\W\d]\w*)\s*$")
+
+    def __init__(self):
+        self._units = {}
+        self._parse = lru_cache(maxsize=1024)(self._parse_system)
+
+    def __contains__(self, unit):
+        return unit in self._units
+
+    def register(self, names, points):
+        """
+        Register one or more unit names as being `points` points long.
+
+        `points` is a number, or a callable taking no arguments and
+        returning one.
+        """
+
+        if isinstance(names, str):
+            names = [names]
+
+        for name in names:
+            self._units[name] = points
+
+        self._parse.cache_clear()
+
+    def _parse_system(self, string):
+
+        res = self._pattern.match(string)
+        if (res is None) or (res.group(2) not in self._units):
+            raise Exception(f"'{string}' is not a valid argument for spacing")
+
+        spacing, unit = res.groups()
+        spacing = 1.0 if spacing is None else float(spacing)
+
+        return spacing, unit
+
+    def parse(self, string):
+        """Return the (spacing, unit) pair described by a system string"""
+
+        return self._parse(str(string))
+
+    def is_dynamic(self, string):
+        """Return whether the size of the system string is given by a callable"""
+
+        _, unit = self.parse(string)
+        return callable(self._units[unit])
+
+    def get_points(self, string):
+        """Return the size of one step of the system string, in points"""
+
+        spacing, unit = self.parse(string)
+        points = self._units[unit]
+        if callable(points):
+            points = points()
+
+        return spacing * points
+
+    def get_scale(self, string, dpi):
+        """
+        Return the number of pixels per step of the system string.
+
+        `dpi` may be a scalar or an array, in which case an array of scale
+        factors is returned.
+        """
+
+        points = self.get_points(string)
+        if np.ndim(dpi):
+            return np.asarray(dpi, dtype=float) * (points / 72)
+
+        return dpi * points / 72
+
+unit_registry = UnitRegistry()
+unit_registry.register(['pt', 'point', 'points'], 1)
+unit_registry.register(['pc', 'pica', 'picas'], 12)
+unit_registry.register(['in', 'inch', 'inches'], 72)
+unit_registry.register(['mm'], 72 / 25.4)
+unit_registry.register(['cm'], 72 / 2.54)
+
+register_unit = unit_registry.register
@@ -0,0 +1,196 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+
+from .metrics import metric_cache
+
+SOFT_HYPHEN = '\u00ad'
+
+################################################
+### Functions
+
+def measure_words(words, renderer, prop):
+    """
+    Return the width of each word, and of a single space, in display units.
+
+    Widths go through the shared metric cache, so a word that appears many
+    times (or in many paragraphs) is only measured once.
+    """
+
+    def measure(s):
+        w, _, _ = metric_cache.get_text_width_height_descent(renderer, s, prop, ismath=False)
+        return w
+
+    widths = [measure(word) if word else 0.0 for word in words]
+
+    # Renderers report the inked extent, which is empty for a lone space
+    space = measure('| |') - measure('||')
+
+    return widths, space
+
+def split_soft_hyphens(word):
+    """Split a word at its soft hyphens (U+00AD)"""
+
+    return word.split(SOFT_HYPHEN)
+
+def break_greedy(widths, space, line_width):
+    """
+    Return the index of the first word on each line, filling every line with
+    as many words as fit in a single pass. A word wider than the line is
+    given a line of its own.
+    """
+
+    starts = [0]
+    current = widths[0]
+    for i, width in enumerate(widths[1:], 1):
+        if current + space + width > line_width:
+            starts.append(i)
+            current = width
+        else:
+            current += space + width
+
+    return starts
+
+def break_optimal(widths, spaces, space, hyphen, line_width, hyphen_penalty=0.1):
+    """
+    Return the index of the first box on each line, choosing the breaks that
+    minimise the raggedness of the whole paragraph (Knuth-Plass style).
+
+    Parameters
+    ----------
+    widths : list of float
+        Widths of the boxes (words, or fragments of hyphenated words).
+    spaces : list of bool
+        For each box but the last, True if it is followed by a space and
+        False if it is followed by a hyphenation point.
+    space, hyphen : float
+        Widths of a space and of a hyphen.
+    line_width : float
+        Target width of the lines.
+    hyphen_penalty : float
+        Cost of breaking at a hyphenation point, relative to a line left
+        completely empty.
+
+    The cost of a line is its squared slack as a fraction of `line_width`,
+    and the last line is free as long as it fits. Only lines that fit are
+    considered, so the run time is linear in the number of boxes times the
+    number of boxes per line.
+    """
+
+    n = len(widths)
+
+    # Prefix sums of box widths, and of the spaces between boxes
+    cum_width = [0.0]
+    for width in widths:
+        cum_width.append(cum_width[-1] + width)
+
+    cum_space = [0]
+    for has_space in spaces:
+        cum_space.append(cum_space[-1] + has_space)
+
+    best = [0.0] + [float('inf')] * n
+    previous = [0] * (n + 1)
+
+    for end in range(n):
+        last = (end == n - 1)
+        hyphenated = (not last) and (not spaces[end])
+
+        for start in range(end, -1, -1):
+            width = (cum_width[end + 1] - cum_width[start]
+                     + space * (cum_space[end] - cum_space[start])
+                     + (hyphen if hyphenated else 0))
+            slack = line_width - width
+
+            # Lines only get wider as they start earlier
+            if (slack < 0) and (start < end):
+                break
+
+            if last and (slack >= 0):
+                cost = 0
+            else:
+                cost = (slack / line_width) ** 2
+            if hyphenated:
+                cost += hyphen_penalty
+
+            total = best[start] + cost
+            if total < best[end + 1]:
+                best[end + 1] = total
+                previous[end + 1] = start
+
+    starts = []
+    i = n
+    while i > 0:
+        i = previous[i]
+        starts.append(i)
+
+    return starts[::-1]
+
+def wrap_lines(text, line_width, renderer, prop, mode='greedy', hyphenate=None):
+    """
+    Wrap text so no line is wider than line_width, keeping existing new lines.
+
+    Parameters
+    ----------
+    mode : {'greedy', 'optimal'}
+        Fill each line in turn, or minimise raggedness across each paragraph
+        (see `break_optimal`).
+    hyphenate : bool or callable, optional
+        In 'optimal' mode, allow breaks inside words. A callable takes a word
+        and returns its fragments; True splits words at soft hyphens.
+
+    Returns
+    -------
+    list of (line, soft) pairs, where soft is True for lines that end at an
+    inserted break rather than at a new line of the original text.
+    """
+
+    if hyphenate is True:
+        hyphenate = split_soft_hyphens
+
+    wrapped_lines = []
+    for unwrapped_line in text.split('\n'):
+        words = unwrapped_line.split(' ')
+
+        if mode == 'greedy':
+            boxes = words
+            spaces = [True] * (len(words) - 1)
+        elif mode == 'optimal':
+            boxes = []
+            spaces = []
+            for word in words:
+                fragments = hyphenate(word) if hyphenate else [word]
+                boxes.extend(fragments)
+                spaces.extend([False] * (len(fragments) - 1) + [True])
+            spaces.pop()
+        else:
+            raise Exception(f"'{mode}' is not a valid wrapping mode")
+
+        widths, space = measure_words(boxes + ['-'], renderer, prop)
+        hyphen = widths.pop()
+
+        if mode == 'greedy':
+            starts = break_greedy(widths, space, line_width)
+        else:
+            starts = break_optimal(widths, spaces, space, hyphen, line_width)
+
+        ends = starts[1:] + [len(boxes)]
+        for start, end in zip(starts, ends):
+            line = boxes[start]
+            for box, has_space in zip(boxes[start+1:end], spaces[start:end-1]):
+                line += (' ' if has_space else '') + box
+            if (end < len(boxes)) and not spaces[end-1]:
+                line += '-'
+
+            wrapped_lines.append((line, end < len(boxes)))
+
+    return wrapped_lines
+
+def wrap_text(text, line_width, renderer, prop, mode='greedy', hyphenate=None):
+    """
+    Return text with new lines inserted so no line is wider than line_width.
+    See `wrap_lines` for the parameters.
+    """
+
+    lines = wrap_lines(text, line_width, renderer, prop, mode=mode, hyphenate=hyphenate)
+    return '\n'.join(line for line, _ in lines)
@@ -1,5 +1,35 @@
 #! /usr/bin/env python3
 
-from .mpltypo import PointFigure, PointAxes, PointTransform, GetTransform
+# Submodules are only imported when one of their names is first used. Note
+# that Text is replaced by SpacedText (and the projection registered) when
+# the figure and axes classes are first used, not on `import mpltypo`. The
+# transforms do not import the figure and axes classes at all.
 
-from .text import SpacedText
\ No newline at end of file
+import importlib
+
+_exports = {
+    'mpltypo': ['PointFigure', 'PointAxes'],
+    'transforms': ['PointTransform', 'GetTransform', 'TransformCache', 'TransformRegistry'],
+    'text': ['SpacedText'],
+}
+
+_modules = {name: module for module, names in _exports.items() for name in names}
+
+__all__ = list(_modules)
+
+def __getattr__(name):
+
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name = _modules[name]
+    module = importlib.import_module(f'.{module_name}', __name__)
+
+    # Bind every export of the submodule at once
+    for export in _exports[module_name]:
+        globals()[export] = getattr(module, export)
+
+    return globals()[name]
+
+def __dir__():
+    return sorted(set(globals()) | set(_modules))
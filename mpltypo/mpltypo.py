@@ -5,148 +5,36 @@
 
 ################################################
 ### Load Dependencies
-import sys
-import importlib
+import functools
 import numpy as np
 
-import matplotlib.pyplot as plt
-from matplotlib.transforms import Bbox, BboxTransformTo, BboxTransformFrom, blended_transform_factory, CompositeGenericTransform
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 import matplotlib.lines as lines
 
+from matplotpatch.grid import DotGrid, BaselineGrid
+from matplotpatch.guides import GuideLayer
+from matplotpatch.hooks import install_text_class
+from matplotpatch.export import export_figure
+from matplotpatch.layout import get_layout_geometry, snap_to_baseline
+
+from .transforms import GetTransform, TransformRegistry
 from .text import SpacedText
 
 ################################################
 # Here lies a "monkey patch" for the Text class (matplotlib.text.Text)
 # Essentially, you redefine the Text class, with SpacedText.
-# Then you reload the modules that depend on Text
-# (axes, figure, pyplot), so they re-initialise
-# with the updated version of the class.
+# The modules that imported Text by name (figure, pyplot) are pointed at
+# the new class in place, rather than reloaded, so Figure, Axes etc. keep
+# their identity. The reloads only cost 10-13 ms (see bench_import.py).
 # https://medium.com/@chipiga86/python-monkey-patching-like-a-boss-87d7ddb8098e
 
-# fyi, I'm sure there's probaby a better way to do this,
-# I just haven't found it yet.
-
-# Redefine matplotlib.text.Text
-from matplotlib import text
-text.Text = SpacedText
-
-# Reload modules (if already loaded) that are
-# dependent on matplotlib.text.Text
-modules = ['axes', 'figure', 'pyplot']
-for mod in modules:
-    mod = f'matplotlib.{mod}'
-    if mod in sys.modules.keys():
-        importlib.reload(sys.modules[mod])
+install_text_class(SpacedText)
         
 ################################################
 ### Classes
 
-class PointTransform(CompositeGenericTransform):
-    """
-    Create a new imperial-unit coordinate system around a given anchor.
-    """
-
-    def __init__(self, object=None, anchor='bl', spacing=12):
-        
-        if isinstance(object, plt.Figure):
-            fig = object
-        elif hasattr(object,'figure'):
-            fig = object.figure
-        else:
-            raise Exception('Cannot find figure from object')
-                         
-        self.obj = object
-        self.fig = fig
-        self.spacing = spacing
-        self.anchor = anchor
-        
-        self.fig_pos = fig.bbox._points
-        self.obj_pos = self.get_object_position()
-        
-        bbox = self.get_bbox()       
-        super().__init__(BboxTransformFrom(bbox), self.fig.transFigure)
-
-    def get_object_position(self):
-        """docstring"""
-        
-        obj_pos = self.fig_pos
-            
-        if isinstance(self.obj, plt.Axes):
-            axis_position = self.obj.get_position()
-            obj_pos = self.fig.transFigure.transform(axis_position)
-        
-        return obj_pos
-    
-    def get_bbox(self):
-        
-        anchors = {
-            'bl' : lambda x: x[0],
-            'tl' : lambda x: x.diagonal(),
-            'tr' : lambda x: x[1],
-            'br' : lambda x: x.flatten()[[2,1]],
-        }
-
-        scale = self.fig._dpi / (72 / self.spacing)
-        points = (self.fig_pos - anchors[self.anchor](self.obj_pos)) / scale
-        bbox =  Bbox(points)
-        return bbox
-    
-
-class GetTransform:
-        
-    def __new__(cls, object=None, system='figure', anchor='bl', spacing=12):
-                
-        fig = None
-        ob = None
-        
-        # Deal with arguments        
-        if object is None:
-            fig = plt.gcf()
-            ob = fig
-        elif isinstance(object, plt.Figure):
-            fig = object
-            ob = fig
-        elif hasattr(object, 'figure'):
-            ob = object
-            fig = object.figure
-        else:
-            raise Exception('Invalid object passed')
-        
-        if isinstance(system, str):
-            system = [system]
-        n = min(2, len(system))
-        
-        transforms = []
-        for i in range(n):
-            syst = system[i]
-            
-            if syst == 'figure':
-                trans = fig.transFigure
-            elif syst == 'axes':
-                trans = ob.transAxes
-            elif syst == 'data':
-                trans = ob.transData
-            elif syst == 'pica':
-                trans = PointTransform(object=ob, anchor=anchor, spacing=12)
-            elif syst == 'inch':
-                trans = PointTransform(object=ob, anchor=anchor, spacing=72)
-            elif syst == 'point':
-                trans = PointTransform(object=ob, anchor=anchor, spacing=1)
-            elif syst == 'unit':
-                trans = PointTransform(object=ob, anchor=anchor, spacing=spacing)
-            else:
-                raise Exception('Incorrect arguments')
-            
-            transforms.append(trans)
-
-        if len(transforms) == 2:
-            transform = blended_transform_factory(*transforms)
-        elif len(transforms) == 1:
-            transform = transforms[0]
-        
-        return transform
-    
-class PointAxes(plt.Axes):
+class PointAxes(Axes):
     """
     Axes wrapper for easy application of transforms to text/plot methods.
     """
@@ -163,6 +51,7 @@ class PointAxes(plt.Axes):
             if 'figure' in kwargs.keys():
                 fig = kwargs['figure']
             else:
+                import matplotlib.pyplot as plt
                 fig = plt.gcf()
                             
             trans = GetTransform(object=fig, system='unit', spacing=spacing)
@@ -174,7 +63,7 @@ class PointAxes(plt.Axes):
         
         super().__init__(fig, rect, **kwargs)
         
-        self._saved_transforms = []
+        self._saved_transforms = TransformRegistry()
 
         self._decorate_methods()        
     
@@ -183,7 +72,7 @@ class PointAxes(plt.Axes):
         def wrapper(*args, system='axes', anchor='bl', spacing=12, **kwargs):
             
             trans = GetTransform(object=self, system=system, anchor=anchor, spacing=spacing)
-            self._saved_transforms.append(trans)
+            self._saved_transforms.add(trans)
             
             handles = func(*args, **kwargs, transform=trans)
             # print(f'Ran {func.__name__} function')
@@ -199,8 +88,18 @@ class PointAxes(plt.Axes):
             fn = getattr(self, method)
             setattr(self, method, self.decorator(fn))
             
-    def align_ticklabels(self, axis=None, system='pica', anchor='bl', spacing=12, **kwargs):
-        """Docstring"""
+    def align_ticklabels(self, axis=None, system='pica', anchor='bl', spacing=12, live=True, **kwargs):
+        """
+        Position the tick labels of an axis in a typographic system, e.g.
+        the x tick labels at y=-2 picas below the axes.
+        
+        With live=True the axis keeps its locator and formatter, so labels
+        follow zooming, panning and animation: whenever the ticks are
+        updated, the alignment is applied to the labels that need it (new
+        ticks, or labels whose transform was reset). With live=False the
+        current labels are formatted once and fixed. Aligning an axis again
+        replaces its previous alignment, live or not.
+        """
 
         if axis == 'x':
             trans = GetTransform(self, system=('data', system), anchor=anchor, spacing=spacing)
@@ -212,16 +111,53 @@ class PointAxes(plt.Axes):
         kwargs.update(transform=trans)
 
         axis_handle = getattr(self, axis.lower()+'axis')    
+        _remove_aligned_ticks(axis_handle)
+
+        if not live:
+            locs = axis_handle.get_ticklocs()
+            strings = [str(round(loc,2)) for loc in locs]
+            axis_handle.set_ticklabels(strings, **kwargs)
+            return
+        
+        # Wrap the tick update of this axis instance only
+        axis_handle._aligned_ticklabels = kwargs
+        axis_handle._update_ticks_unaligned = axis_handle._update_ticks
+        axis_handle._update_ticks = functools.partial(_update_aligned_ticks, axis_handle)
+        
+        axis_handle.stale = True
 
-        locs = axis_handle.get_ticklocs()
-        strings = [str(round(loc,2)) for loc in locs]
-        axis_handle.set_ticklabels(strings, **kwargs)
+def _remove_aligned_ticks(axis):
+    """Restore the tick update of an axis wrapped by align_ticklabels"""
+    
+    if hasattr(axis, '_update_ticks_unaligned'):
+        del axis._update_ticks
+        del axis._update_ticks_unaligned
+        del axis._aligned_ticklabels
+
+def _update_aligned_ticks(axis):
+    """
+    Update the ticks of an axis as usual, then align the tick labels that
+    are not aligned yet. Labels already aligned are left untouched, so
+    their cached layout stays valid.
+    """
+    
+    ticks = axis._update_ticks_unaligned()
+    
+    kwargs = axis._aligned_ticklabels
+    trans = kwargs['transform']
+    for tick in ticks:
+        for label in [tick.label1, tick.label2]:
+            if (getattr(label, '_aligned_with', None) is not kwargs) or (label.get_transform() is not trans):
+                label.update(kwargs)
+                label._aligned_with = kwargs
+    
+    return ticks
 
 import matplotlib.projections as proj
 proj.register_projection(PointAxes)
 
 
-class PointFigure(plt.Figure):
+class PointFigure(Figure):
     
     _methods_to_decorate = [
         'text',
@@ -230,8 +166,10 @@ class PointFigure(plt.Figure):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        self._saved_transforms = []
+        self._saved_transforms = TransformRegistry()
         self._dotgrid = None
+        self._baseline_grid = None
+        self._guides = GuideLayer(self)
 
         self._decorate_methods()        
 
@@ -240,7 +178,7 @@ class PointFigure(plt.Figure):
         def wrapper(*args, system='figure', anchor='bl', spacing=12, **kwargs):
             
             trans = GetTransform(object=self, system=system, anchor=anchor, spacing=spacing)
-            self._saved_transforms.append(trans)
+            self._saved_transforms.add(trans)
             
             handles = func(*args, **kwargs, transform=trans)
             # print(f'Ran {func.__name__} function')
@@ -256,51 +194,114 @@ class PointFigure(plt.Figure):
             fn = getattr(self, method)
             setattr(self, method, self.decorator(fn))
 
-    def draw_dotgrid(self, system='inch', interval=1, **kwargs):
+    def draw_dotgrid(self, system='inch', interval=1, levels=None, **kwargs):
+        """
+        Add a grid of dots to the figure, hidden until `show_dotgrid`.
         
-        kwargs = {
-            'c': (0.8,0.8,0.8),
-            'lw': 0,
-            'marker': '.',
-            'ms': 1,
-            'zorder': -1,
-            **kwargs,
-        }
+        levels is a list of dicts, each with a 'system', an 'interval' and
+        the style arguments of `DotGrid.add_level`, drawn in order. By
+        default a single level is drawn, every interval units of system and
+        styled with kwargs.
+        """
         
-        trans = GetTransform(self, system=system)
-
-        bbox = self.bbox._points
-        coords = trans.inverted().transform(bbox)
-        string = f"""Transformation has units: 
-            (Horizontal) {coords[0,0]} --> {coords[1,0]} 
-            (Vertical)   {coords[0,1]} --> {coords[1,1]}"""
-        print(string)
-
-        x = np.arange(*coords[:,0], interval)[1:]
-        y = np.arange(*coords[:,1], interval)[1:]
-
-        line_x = np.tile(x,len(y))
-        line_y = np.repeat(y, len(x))
-
-        self._dotgrid = lines.Line2D(line_x, line_y, transform=trans, figure=self, **kwargs)
-        self.lines.append(self._dotgrid)
-        self.hide_dotgrid()
+        if levels is None:
+            levels = [dict(system=system, interval=interval, **kwargs)]
+        
+        guides = self.get_guide_layer()
+        if self._dotgrid is not None:
+            guides.remove_guide(self._dotgrid)
+        
+        self._dotgrid = DotGrid(self)
+        for level in levels:
+            level = dict(level)
+            trans = GetTransform(self, system=level.pop('system', 'inch'))
+            self._dotgrid.add_level(trans, **level)
+            
+        guides.add_guide(self._dotgrid, visible=False)
         
     def show_dotgrid(self, *args, **kwargs):
         if self._dotgrid is None:
             self.draw_dotgrid(*args, **kwargs)
         
-        self._dotgrid.set_visible(True)
+        self.get_guide_layer().set_guide_visible(self._dotgrid, True)
         
     def hide_dotgrid(self):
-        self._dotgrid.set_visible(False)
+        if self._dotgrid is not None:
+            self.get_guide_layer().set_guide_visible(self._dotgrid, False)
+        
+    def draw_baseline_grid(self, system='point', interval=12, anchor='bl', **kwargs):
+        """
+        Add a baseline grid, rules every interval units of system, hidden
+        until `show_baseline_grid`. kwargs are passed to `BaselineGrid`.
+        """
+        
+        guides = self.get_guide_layer()
+        if self._baseline_grid is not None:
+            guides.remove_guide(self._baseline_grid)
         
-    def line(self, *args, system='pica', anchor='bl', spacing=12, **kwargs):
+        trans = GetTransform(self, system=system, anchor=anchor)
+        self._baseline_grid = BaselineGrid(self, trans, interval=interval, **kwargs)
+        guides.add_guide(self._baseline_grid, visible=False)
+        
+    def show_baseline_grid(self, *args, **kwargs):
+        if self._baseline_grid is None:
+            self.draw_baseline_grid(*args, **kwargs)
+        
+        self.get_guide_layer().set_guide_visible(self._baseline_grid, True)
+        
+    def hide_baseline_grid(self):
+        if self._baseline_grid is not None:
+            self.get_guide_layer().set_guide_visible(self._baseline_grid, False)
+        
+    def get_guide_layer(self):
+        """
+        Return the `GuideLayer` drawing the guides of the figure underneath
+        its content, adding it again if the figure was cleared.
+        """
+        
+        if self._guides not in self.artists:
+            for artist in self._guides.get_artists():
+                self.add_artist(artist)
+        
+        return self._guides
+        
+    def get_layout_geometry(self, system='point', anchor='bl', format='records'):
+        """
+        Return the geometry of the figure's text, axes and dotgrid, laid out
+        without drawing. See `matplotpatch.layout.get_layout_geometry`.
+        """
+        
+        return get_layout_geometry(self, system=system, anchor=anchor, format=format, factory=GetTransform)
+        
+    def snap_to_baseline(self, system=None, interval=None, anchor='bl', linespacing=True):
+        """
+        Move the figure's text onto its baseline grid, and return the texts
+        that were moved. See `matplotpatch.layout.snap_to_baseline`.
+        """
+        
+        return snap_to_baseline(self, system=system, interval=interval, anchor=anchor, linespacing=linespacing, factory=GetTransform)
+        
+    def export(self, paths, dpis=None, **kwargs):
+        """
+        Save the figure to several files in one call. Only raster files
+        sharing a dpi (PNG and TIFF) are drawn once; every other file,
+        vector formats included, is drawn separately. See
+        `matplotpatch.export.export_figure`.
+        
+            fig.export(['figure.png', 'figure.tif'], dpis=450)
+        """
+        
+        return export_figure(self, paths, dpis=dpis, **kwargs)
+        
+    def line(self, *args, system='pica', anchor='bl', spacing=12, guide=False, **kwargs):
         
         trans = GetTransform(object=self, system=system, anchor=anchor, spacing=spacing)
             
         line = lines.Line2D(*args, transform=trans, **kwargs)
-        self.lines.append(line)
+        if guide:
+            self.get_guide_layer().add_guide(line)
+        else:
+            self.lines.append(line)
         
         return line
 
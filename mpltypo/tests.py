@@ -0,0 +1,73 @@
+#! /usr/bin/env python3
+
+# Run with: python -m pytest mpltypo/tests.py (or python -m unittest mpltypo.tests)
+
+################################################
+### Load Dependencies
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules a script only building transforms should not pay for
+HEAVY_MODULES = ['matplotlib.pyplot', 'matplotlib.figure', 'matplotlib.axes', 'matplotlib.offsetbox', 'matplotlib.text']
+
+def get_loaded(stmt, modules):
+    """Return the modules that are loaded after running stmt in a new interpreter"""
+
+    code = f"{stmt}\nimport sys\nprint(','.join(m for m in {modules!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    lines = out.stdout.strip().splitlines()
+    return [m for m in lines[-1].split(',') if m] if lines else []
+
+################################################
+### Tests
+
+class TestImports(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        self.assertEqual(get_loaded("import mpltypo", HEAVY_MODULES), [])
+
+    def test_transforms_are_light(self):
+        stmt = "from mpltypo import GetTransform, PointTransform, TransformCache, TransformRegistry"
+        self.assertEqual(get_loaded(stmt, HEAVY_MODULES), [])
+
+class TestTransforms(unittest.TestCase):
+
+    def test_transform_of_figure(self):
+
+        from matplotlib.figure import Figure
+        from mpltypo import GetTransform
+
+        fig = Figure(figsize=(4, 2), dpi=100)
+        trans = GetTransform(fig, system='point', anchor='tl')
+
+        # 72 points right of and below the top left corner, in pixels
+        self.assertEqual(tuple(trans.transform((72, -72))), (100, 100))
+        self.assertIs(GetTransform(fig, system='point', anchor='tl'), trans)
+
+    def test_cache_shrinks_after_clf(self):
+
+        import gc
+        from mpltypo import PointFigure
+
+        fig = PointFigure()
+        for _ in range(20):
+            fig.clf()
+            ax = fig.add_axes([0.1, 0.1, 0.8, 0.8], projection='pointaxes')
+            ax.text(1, 1, 'text', system='pica')
+
+        size = len(fig._transform_cache)
+        del ax
+        fig.clf()
+        gc.collect()
+
+        self.assertGreater(size, 0)
+        self.assertEqual(len(fig._transform_cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
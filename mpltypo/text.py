@@ -8,16 +8,46 @@ import numpy as np
 import matplotlib.cbook as cbook
 from matplotlib.text import Text
 from matplotlib.transforms import Bbox, Affine2D
+
+from matplotpatch.metrics import metric_cache, scale_layout, get_font_key, get_renderer_key, get_headless_renderer
+from matplotpatch.wrap import wrap_text
         
 class SpacedText(Text):
     
-    def __init__(self, *args, linewidth=None, **kwargs):
+    # Layouts in units of points, shared by every dpi (see `_get_layout`)
+    _layout_cache = cbook.maxdict(1024)
+    
+    def __init__(self, *args, linewidth=None, exact_layout=False, **kwargs):
         super().__init__(*args, **kwargs)
         
         self._linewidth = linewidth
         if linewidth:
             self._wrap = True
             
+        self._exact_layout = exact_layout
+            
+    def set_exact_layout(self, exact):
+        """
+        Set whether the layout is measured again at every dpi.
+        
+        By default a layout computed at one dpi is rescaled for the others,
+        which ignores the (small) effect of font hinting on text extents.
+        """
+        self._exact_layout = exact
+        self.stale = True
+        
+    def _get_layout_key(self, renderer):
+        """
+        Return a hashable tuple of the properties the layout depends on,
+        excluding the dpi. The font is keyed on the file it resolves to, and
+        the renderer on its type, since hinting differs between Agg and the
+        vector backends.
+        """
+        kind = get_renderer_key(renderer)
+        return (self.get_text(), self._verticalalignment, self._horizontalalignment,
+                self._multialignment, hash(self._fontproperties), get_font_key(self._fontproperties),
+                kind, self._rotation, self._rotation_mode, self._linespacing, self.get_usetex())
+            
     def set_verticalalignment(self, align):
         """
         Set the vertical alignment
@@ -32,6 +62,19 @@ class SpacedText(Text):
         self._verticalalignment = align
         self.stale = True
     
+    def get_window_extent(self, renderer=None, dpi=None):
+        """
+        Return the `.Bbox` bounding the text, in display units.
+        
+        If the figure has not been drawn yet and no renderer is given, the
+        text is measured from the font files, without a canvas.
+        """
+        # AG edit
+        if (renderer is None) and (self._renderer is None) and (self.figure._cachedRenderer is None):
+            renderer = get_headless_renderer(self.figure.dpi if dpi is None else dpi)
+            
+        return super().get_window_extent(renderer=renderer, dpi=dpi)
+    
     def _get_wrap_line_width(self):
         """
         Return the maximum line width for wrapping text based on the current
@@ -63,6 +106,19 @@ class SpacedText(Text):
 
         return line_width
     
+    def _get_wrapped_text(self):
+        """
+        Return a copy of the text with new lines added, so that the text is
+        wrapped to `_get_wrap_line_width`.
+        """
+        # AG edit - measure each word once, rather than every growing
+        # prefix of the line as matplotlib does
+        if self.get_usetex():
+            return self.get_text()
+        
+        line_width = self._get_wrap_line_width()
+        return wrap_text(self.get_text(), line_width, self._renderer, self._fontproperties)
+    
     def _get_layout(self, renderer):
         """
         return the extent (bbox) of the text together with
@@ -72,6 +128,16 @@ class SpacedText(Text):
         key = self.get_prop_tup(renderer=renderer)
         if key in self._cached:
             return self._cached[key]
+        
+        # AG edit - the layout is linear in dpi, so one computed at another
+        # dpi is rescaled rather than measured again
+        pixels_per_pt = 1/72*self.figure._dpi
+        if not self._exact_layout:
+            layout_key = self._get_layout_key(renderer)
+            if layout_key in self._layout_cache:
+                ret = scale_layout(self._layout_cache[layout_key], pixels_per_pt)
+                self._cached[key] = ret
+                return ret
 
         thisx, thisy = 0.0, 0.0
         lines = self.get_text().split("\n")  # Ensures lines is not empty.
@@ -82,20 +148,19 @@ class SpacedText(Text):
         ys = []
 
         # Full vertical extent of font, including ascenders and descenders:
-        _, lp_h, lp_d = renderer.get_text_width_height_descent(
-            "lp", self._fontproperties,
+        _, lp_h, lp_d = metric_cache.get_text_width_height_descent(
+            renderer, "lp", self._fontproperties,
             ismath="TeX" if self.get_usetex() else False)
         min_dy = (lp_h - lp_d) * self._linespacing
         
         # AG edit
-        pixels_per_pt = 1/72*self.figure._dpi
         line_height = (pixels_per_pt * self.get_fontsize()) * self._linespacing
 
         for i, line in enumerate(lines):
             clean_line, ismath = self._preprocess_math(line)
             if clean_line:
-                w, h, d = renderer.get_text_width_height_descent(
-                    clean_line, self._fontproperties, ismath=ismath)
+                w, h, d = metric_cache.get_text_width_height_descent(
+                    renderer, clean_line, self._fontproperties, ismath=ismath)
             else:
                 w = h = d = 0
 
@@ -228,4 +293,6 @@ class SpacedText(Text):
 
         ret = bbox, list(zip(lines, zip(ws, hs), *xys.T)), descent
         self._cached[key] = ret
+        if not self._exact_layout:
+            self._layout_cache[layout_key] = scale_layout(ret, 1/pixels_per_pt)
         return ret
@@ -0,0 +1,289 @@
+#! /usr/bin/env python3
+
+################################################
+### Load Dependencies
+import sys
+import weakref
+from collections import namedtuple, OrderedDict
+import numpy as np
+
+from matplotlib.transforms import Bbox, Affine2DBase, blended_transform_factory
+
+# Figures and axes are recognised without importing matplotlib.figure or
+# matplotlib.axes (and everything they import): if the module is not
+# loaded yet, object cannot be one of its instances.
+
+def _is_figure(object):
+    module = sys.modules.get('matplotlib.figure')
+    return (module is not None) and isinstance(object, module.Figure)
+
+def _is_axes(object):
+    module = sys.modules.get('matplotlib.axes')
+    return (module is not None) and isinstance(object, module.Axes)
+
+################################################
+### Classes
+
+class PointTransform(Affine2DBase):
+    """
+    Create a new imperial-unit coordinate system around a given anchor.
+    
+    The transform is a node in matplotlib's transform tree, with the figure
+    bbox (size and dpi) and the axes position as its children. Its matrix is
+    only recomputed when one of those changes.
+    """
+    
+    _anchors = {
+        'bl' : lambda x: x[0],
+        'tl' : lambda x: x.diagonal(),
+        'tr' : lambda x: x[1],
+        'br' : lambda x: x.flatten()[[2,1]],
+    }
+
+    def __init__(self, object=None, anchor='bl', spacing=12):
+        super().__init__()
+        
+        if _is_figure(object):
+            fig = object
+        elif hasattr(object,'figure'):
+            fig = object.figure
+        else:
+            raise Exception('Cannot find figure from object')
+                         
+        self.obj = object
+        self.fig = fig
+        self.spacing = spacing
+        self.anchor = anchor
+        
+        if _is_axes(object):
+            self.set_children(fig.bbox, object._position)
+        else:
+            self.set_children(fig.bbox)
+        
+        self._mtx = None
+        self._inverted = None
+    
+    @property
+    def fig_pos(self):
+        return self.fig.bbox.get_points()
+    
+    @property
+    def obj_pos(self):
+        return self.get_object_position()
+
+    def get_object_position(self):
+        """Return the corners of the anchoring object, in display coordinates"""
+        
+        obj_pos = self.fig_pos
+            
+        if _is_axes(self.obj):
+            axis_position = self.obj._position.get_points()
+            obj_pos = self.fig.transFigure.transform(axis_position)
+        
+        return obj_pos
+    
+    def get_bbox(self):
+        """Return the figure extent, in units of this coordinate system"""
+        
+        points = (self.fig_pos - self._anchors[self.anchor](self.obj_pos)) / self.get_scale()
+        bbox =  Bbox(points)
+        return bbox
+    
+    def get_scale(self):
+        """Return the number of pixels per unit"""
+        
+        return self.fig._dpi / (72 / self.spacing)
+    
+    def get_matrix(self):
+        if self._invalid:
+            scale = self.get_scale()
+            x0, y0 = self._anchors[self.anchor](self.get_object_position())
+            self._mtx = np.array([[scale, 0.0  , x0 ],
+                                  [0.0  , scale, y0 ],
+                                  [0.0  , 0.0  , 1.0]],
+                                 float)
+            self._inverted = None
+            self._invalid = 0
+        return self._mtx
+    
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'size'])
+
+class TransformCache(object):
+    """
+    Per-figure memo of the transforms built by GetTransform.
+    
+    Entries are keyed on (object, system, anchor, spacing). The transforms
+    follow figure resizes, dpi changes and `set_position` by themselves, so
+    entries never go stale. Both the object and the transforms are held
+    weakly: an entry lives as long as an artist is using its transform,
+    and no longer than its axes, e.g. after `clf`.
+    """
+    
+    def __init__(self):
+        self._entries = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        
+    def __len__(self):
+        return sum(len(entries) for entries in list(self._entries.values()))
+    
+    def get(self, key):
+        """Return the cached transform for key, or None if missing"""
+        
+        entries = self._entries.get(key[0])
+        ref = entries.get(key[1:]) if entries is not None else None
+        transform = ref() if ref is not None else None
+        if transform is not None:
+            self.hits += 1
+            return transform
+        
+        self.misses += 1
+        return None
+    
+    def set(self, key, transform):
+        
+        owner, rest = key[0], key[1:]
+        entries = self._entries.get(owner)
+        if entries is None:
+            entries = self._entries[owner] = {}
+        
+        def discard(ref, entries=entries):
+            if entries.get(rest) is ref:
+                del entries[rest]
+                
+        entries[rest] = weakref.ref(transform, discard)
+        
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, len(self))
+
+RegistryStats = namedtuple('RegistryStats', ['size', 'maxsize', 'nbytes'])
+
+class TransformRegistry(object):
+    """
+    Weak, bounded record of the transforms handed out to an object's artists.
+    
+    Each transform is stored once, no matter how often it is reused, and is
+    dropped as soon as the last artist holding it is garbage collected. If
+    more than `maxsize` transforms are alive, the least recently used ones
+    are forgotten (the artists keep working, they just aren't tracked).
+    """
+    
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._refs = OrderedDict()
+        
+    def __len__(self):
+        return len(self._refs)
+    
+    def __iter__(self):
+        for ref in list(self._refs.values()):
+            transform = ref()
+            if transform is not None:
+                yield transform
+                
+    def __contains__(self, transform):
+        ref = self._refs.get(id(transform))
+        return (ref is not None) and (ref() is transform)
+    
+    def add(self, transform):
+        """Register transform, returning it for convenience"""
+        
+        key = id(transform)
+        if transform in self:
+            self._refs.move_to_end(key)
+            return transform
+        
+        def discard(ref, refs=self._refs):
+            if refs.get(key) is ref:
+                del refs[key]
+        
+        self._refs[key] = weakref.ref(transform, discard)
+        while len(self._refs) > self.maxsize:
+            self._refs.popitem(last=False)
+            
+        return transform
+    
+    def clear(self):
+        self._refs.clear()
+        
+    def stats(self):
+        """Return the number of tracked transforms and their approximate size in bytes"""
+        
+        nbytes = sys.getsizeof(self._refs)
+        for transform in self:
+            nbytes += sys.getsizeof(transform) + sys.getsizeof(transform.__dict__)
+            
+        return RegistryStats(len(self._refs), self.maxsize, nbytes)
+
+class GetTransform:
+        
+    def __new__(cls, object=None, system='figure', anchor='bl', spacing=12):
+                
+        fig = None
+        ob = None
+        
+        # Deal with arguments        
+        if object is None:
+            import matplotlib.pyplot as plt
+            fig = plt.gcf()
+            ob = fig
+        elif _is_figure(object):
+            fig = object
+            ob = fig
+        elif hasattr(object, 'figure'):
+            ob = object
+            fig = object.figure
+        else:
+            raise Exception('Invalid object passed')
+        
+        if isinstance(system, str):
+            system = [system]
+        n = min(2, len(system))
+        
+        # Reuse the transform if this figure already built it
+        cache = getattr(fig, '_transform_cache', None)
+        if cache is None:
+            cache = fig._transform_cache = TransformCache()
+            
+        key = (ob, tuple(system[:n]), anchor, spacing)
+        transform = cache.get(key)
+        if transform is not None:
+            return transform
+        
+        transforms = []
+        for i in range(n):
+            syst = system[i]
+            
+            if syst == 'figure':
+                trans = fig.transFigure
+            elif syst == 'axes':
+                trans = ob.transAxes
+            elif syst == 'data':
+                trans = ob.transData
+            elif syst == 'pica':
+                trans = PointTransform(object=ob, anchor=anchor, spacing=12)
+            elif syst == 'inch':
+                trans = PointTransform(object=ob, anchor=anchor, spacing=72)
+            elif syst == 'point':
+                trans = PointTransform(object=ob, anchor=anchor, spacing=1)
+            elif syst == 'unit':
+                trans = PointTransform(object=ob, anchor=anchor, spacing=spacing)
+            else:
+                raise Exception('Incorrect arguments')
+            
+            transforms.append(trans)
+
+        if len(transforms) == 2:
+            transform = blended_transform_factory(*transforms)
+        elif len(transforms) == 1:
+            transform = transforms[0]
+        
+        cache.set(key, transform)
+        
+        return transform